@@ -1,203 +1,757 @@
+from array import array
 from collections import deque
 import heapq
-import time
-from grid_elements import spawn_dynamic
+from grid_elements import spawn_dynamic, BLOCKED, DIRECTIONS, COST_INF
+from dstar_lite import DStarLite
+from hpa import HPAGraph
+from metrics import SearchStats, begin, search_clock
 
 # Set a global timeout for searches (in seconds)
 SEARCH_TIMEOUT = 10 
+# Depth limit used when DLS is run on its own
+DLS_DEPTH_LIMIT = 30
+# Inflation factor used by Weighted A* (1.0 would be plain A*)
+WEIGHTED_ASTAR_W = 2.0
+# Every move, straight or diagonal, costs 1 in get_neighbors' grid
+DIAGONAL_COST = 1
+
+def null_draw(node, color_key=None, frontier_val=0, explored_val=0):
+    """
+    Observer that ignores every event. Passing it as `draw` lets any
+    search run headless at full speed (it never returns "BREAK").
+    """
+    return None
 
 def reconstruct_path(node):
     """Rebuilds the path from target to start by following parents."""
+    grid, idx = node.grid, node.idx
     path = []
-    while node:
-        path.append(node)
-        node = node.parent
+    while idx != -1:
+        path.append(grid.node(idx))
+        idx = grid.get_parent(idx)
     return path[::-1]
 
-def bfs(start, target, grid, draw):
+def bfs(start, target, grid, draw, stats=None, hooks=None):
     """Breadth-First Search: Explores layer by layer."""
-    start_time = time.time()
-    queue = deque([start])
-    visited = {start}
+    start_time = search_clock()
+    stats, on_expand, on_push = begin("BFS", stats, hooks)
+    gen = grid.reset()
+    node, parent, costs, stamp = grid.node, grid.parent, grid.cost, grid.stamp
+    links, steps = grid.links, grid.steps
+    s, t = start.idx, target.idx
+    grid.touch(s)
+    costs[s] = 0
+    queue = deque([s])
+    visited = 1
     
     while queue:
         # Check for Timeout or Break signal
-        if time.time() - start_time > SEARCH_TIMEOUT:
+        if search_clock() - start_time > SEARCH_TIMEOUT:
             print("BFS: Search timed out!")
-            return None
+            return stats.finish("timeout")
             
         curr = queue.popleft()
-        if curr == target: return reconstruct_path(curr)
+        if curr == t: return stats.finish("found", reconstruct_path(target))
+        stats.expansions += 1
+        if on_expand: on_expand(curr)
         
-        for n in curr.get_neighbors(grid):
-            if n not in visited:
-                n.parent = curr
-                visited.add(n)
+        for d in steps[links[curr]]:
+            n = curr + d
+            if stamp[n] != gen:
+                stamp[n] = gen
+                parent[n] = curr
+                costs[n] = costs[curr] + 1
+                visited += 1
                 queue.append(n)
+                stats.pushes += 1
+                if on_push: on_push(n)
                 # Signal check: if draw returns "BREAK", terminate search
-                if draw(n, "FRONTIER", len(queue), len(visited)) == "BREAK":
-                    return None
+                if draw(node(n), "FRONTIER", len(queue), visited) == "BREAK":
+                    return stats.finish("break")
         
-        if draw(curr, "EXPLORED", len(queue), len(visited)) == "BREAK":
-            return None
+        if len(queue) > stats.peak_frontier: stats.peak_frontier = len(queue)
+        if draw(node(curr), "EXPLORED", len(queue), visited) == "BREAK":
+            return stats.finish("break")
             
         spawn_dynamic(grid)
-    return None
+    return stats.finish("no_path")
 
-def dfs(start, target, grid, draw):
+def dfs(start, target, grid, draw, stats=None, hooks=None):
     """Depth-First Search: Explores as deep as possible first."""
-    start_time = time.time()
-    stack = [start]
-    visited = {start}
+    start_time = search_clock()
+    stats, on_expand, on_push = begin("DFS", stats, hooks)
+    gen = grid.reset()
+    node, parent, costs, stamp = grid.node, grid.parent, grid.cost, grid.stamp
+    links, steps = grid.links, grid.steps
+    s, t = start.idx, target.idx
+    grid.touch(s)
+    costs[s] = 0
+    stack = [s]
+    visited = 1
     
     while stack:
-        if time.time() - start_time > SEARCH_TIMEOUT:
+        if search_clock() - start_time > SEARCH_TIMEOUT:
             print("DFS: Search timed out!")
-            return None
+            return stats.finish("timeout")
             
         curr = stack.pop()
-        if curr == target: return reconstruct_path(curr)
+        if curr == t: return stats.finish("found", reconstruct_path(target))
+        stats.expansions += 1
+        if on_expand: on_expand(curr)
         
-        for n in curr.get_neighbors(grid):
-            if n not in visited:
-                n.parent = curr
-                visited.add(n)
+        for d in steps[links[curr]]:
+            n = curr + d
+            if stamp[n] != gen:
+                stamp[n] = gen
+                parent[n] = curr
+                costs[n] = costs[curr] + 1
+                visited += 1
                 stack.append(n)
-                if draw(n, "FRONTIER", len(stack), len(visited)) == "BREAK":
-                    return None
+                stats.pushes += 1
+                if on_push: on_push(n)
+                if draw(node(n), "FRONTIER", len(stack), visited) == "BREAK":
+                    return stats.finish("break")
         
-        if draw(curr, "EXPLORED", len(stack), len(visited)) == "BREAK":
-            return None
+        if len(stack) > stats.peak_frontier: stats.peak_frontier = len(stack)
+        if draw(node(curr), "EXPLORED", len(stack), visited) == "BREAK":
+            return stats.finish("break")
             
         spawn_dynamic(grid)
-    return None
+    return stats.finish("no_path")
 
-def ucs(start, target, grid, draw):
+def ucs(start, target, grid, draw, stats=None, hooks=None):
     """Uniform-Cost Search: Priority queue based on cumulative cost."""
-    start_time = time.time()
+    start_time = search_clock()
+    stats, on_expand, on_push = begin("UCS", stats, hooks)
+    gen = grid.reset()
+    node, parent, costs = grid.node, grid.parent, grid.cost
+    stamp, seen = grid.stamp, grid.seen
+    links, steps = grid.links, grid.steps
+    s, t = start.idx, target.idx
     count = 0 
-    pq = [(0, count, start)]
-    start.cost = 0
-    visited = set()
+    pq = [(0, count, s)]
+    grid.touch(s)
+    costs[s] = 0
+    visited = 0
     
     while pq:
-        if time.time() - start_time > SEARCH_TIMEOUT:
+        if search_clock() - start_time > SEARCH_TIMEOUT:
             print("UCS: Search timed out!")
-            return None
+            return stats.finish("timeout")
             
         cost, _, curr = heapq.heappop(pq)
-        if curr in visited: continue
-        visited.add(curr)
+        if seen[curr] == gen: continue
+        seen[curr] = gen
+        visited += 1
         
-        if curr == target: return reconstruct_path(curr)
+        if curr == t: return stats.finish("found", reconstruct_path(target))
+        stats.expansions += 1
+        if on_expand: on_expand(curr)
         
-        for n in curr.get_neighbors(grid):
+        for d in steps[links[curr]]:
+            n = curr + d
             new_cost = cost + 1 
-            if new_cost < n.cost:
-                n.cost = new_cost
-                n.parent = curr
+            if stamp[n] != gen or new_cost < costs[n]:
+                if stamp[n] == gen: stats.repushes += 1
+                stamp[n] = gen
+                costs[n] = new_cost
+                parent[n] = curr
                 count += 1
                 heapq.heappush(pq, (new_cost, count, n))
-                if draw(n, "FRONTIER", len(pq), len(visited)) == "BREAK":
-                    return None
+                stats.pushes += 1
+                if on_push: on_push(n)
+                if draw(node(n), "FRONTIER", len(pq), visited) == "BREAK":
+                    return stats.finish("break")
         
-        if draw(curr, "EXPLORED", len(pq), len(visited)) == "BREAK":
-            return None
+        if len(pq) > stats.peak_frontier: stats.peak_frontier = len(pq)
+        if draw(node(curr), "EXPLORED", len(pq), visited) == "BREAK":
+            return stats.finish("break")
             
         spawn_dynamic(grid)
-    return None
+    return stats.finish("no_path")
 
-def dls(curr, target, limit, grid, draw, depth=0, visited=None, start_time=None):
-    """Depth-Limited Search: Helper for IDDFS."""
-    if visited is None: visited = set()
-    
-    # Check for Timeout in recursion
-    if start_time and time.time() - start_time > SEARCH_TIMEOUT:
-        return "TIMEOUT"
-    
-    if curr == target: return reconstruct_path(curr)
-    if depth >= limit: return None
-    
-    visited.add(curr)
+def octile(a, b, cols, diagonal=DIAGONAL_COST):
+    """
+    Octile distance between cell indices a and b. With the unit diagonal
+    cost used by the grid this is the Chebyshev distance, which is
+    consistent for 8-connected moves.
+    """
+    dr = abs(a // cols - b // cols)
+    dc = abs(a % cols - b % cols)
+    if dr < dc: dr, dc = dc, dr
+    return dr + (diagonal - 1) * dc
+
+def astar(start, target, grid, draw, weight=1, stats=None, hooks=None):
+    """A* Search: UCS ordered by cost + weight * octile distance to the target."""
+    start_time = search_clock()
+    stats, on_expand, on_push = begin("A*" if weight == 1 else "Weighted A*", stats, hooks)
+    gen = grid.reset()
+    node, parent, costs = grid.node, grid.parent, grid.cost
+    stamp, seen = grid.stamp, grid.seen
+    links, steps = grid.links, grid.steps
+    cols = grid.cols
+    s, t = start.idx, target.idx
+    tr, tc = divmod(t, cols)
+    count = 0
+    h = octile(s, t, cols)
+    # Ties on f prefer the node closer to the target (smaller h)
+    pq = [(weight * h, h, count, s)]
+    grid.touch(s)
+    costs[s] = 0
+    visited = 0
     
-    # Check for Break signal in recursion
-    if draw(curr, "EXPLORED", depth, len(visited)) == "BREAK":
-        return "BREAK"
+    while pq:
+        if search_clock() - start_time > SEARCH_TIMEOUT:
+            print("A*: Search timed out!")
+            return stats.finish("timeout")
+            
+        _, _, _, curr = heapq.heappop(pq)
+        if seen[curr] == gen: continue
+        seen[curr] = gen
+        visited += 1
+        
+        if curr == t: return stats.finish("found", reconstruct_path(target))
+        stats.expansions += 1
+        if on_expand: on_expand(curr)
+        
+        new_cost = costs[curr] + 1
+        for d in steps[links[curr]]:
+            n = curr + d
+            if stamp[n] != gen or new_cost < costs[n]:
+                if stamp[n] == gen: stats.repushes += 1
+                stamp[n] = gen
+                costs[n] = new_cost
+                parent[n] = curr
+                count += 1
+                # Inlined octile() with unit diagonals
+                nr, nc = divmod(n, cols)
+                h = max(abs(nr - tr), abs(nc - tc))
+                heapq.heappush(pq, (new_cost + weight * h, h, count, n))
+                stats.pushes += 1
+                if on_push: on_push(n)
+                if draw(node(n), "FRONTIER", len(pq), visited) == "BREAK":
+                    return stats.finish("break")
+        
+        if len(pq) > stats.peak_frontier: stats.peak_frontier = len(pq)
+        if draw(node(curr), "EXPLORED", len(pq), visited) == "BREAK":
+            return stats.finish("break")
+            
+        spawn_dynamic(grid)
+    return stats.finish("no_path")
+
+def weighted_astar(start, target, grid, draw, w=WEIGHTED_ASTAR_W, stats=None, hooks=None):
+    """Weighted A*: inflates the heuristic by w, trading optimality (within w) for speed."""
+    return astar(start, target, grid, draw, weight=w, stats=stats, hooks=hooks)
+
+def _jump(grid, r, c, dr, dc, tr, tc):
+    """
+    JPS helper: walks from (r, c) in direction (dr, dc) until it finds a jump
+    point (the target, a cell with a forced neighbor, or for diagonals a cell
+    whose straight sub-scans find one). Returns its index, or -1 if blocked.
+    """
+    rows, cols, flags = grid.rows, grid.cols, grid.flags
+
+    def free(r, c):
+        return 0 <= r < rows and 0 <= c < cols and not flags[r * cols + c] & BLOCKED
+
+    while True:
+        r += dr; c += dc
+        if not free(r, c): return -1
+        if r == tr and c == tc: return r * cols + c
+        if dr and dc:
+            if (not free(r - dr, c) and free(r - dr, c + dc)) or \
+               (not free(r, c - dc) and free(r + dr, c - dc)):
+                return r * cols + c
+            if _jump(grid, r, c, dr, 0, tr, tc) != -1 or _jump(grid, r, c, 0, dc, tr, tc) != -1:
+                return r * cols + c
+        elif dr:
+            if (not free(r, c - 1) and free(r + dr, c - 1)) or \
+               (not free(r, c + 1) and free(r + dr, c + 1)):
+                return r * cols + c
+        else:
+            if (not free(r - 1, c) and free(r - 1, c + dc)) or \
+               (not free(r + 1, c) and free(r + 1, c + dc)):
+                return r * cols + c
+
+def _jps_directions(grid, curr, par):
+    """Pruned successor directions of `curr` when reached from jump point `par`."""
+    if par == -1:
+        return DIRECTIONS
+    rows, cols, flags = grid.rows, grid.cols, grid.flags
+    r, c = divmod(curr, cols)
+    pr, pc = divmod(par, cols)
+    dr = (r > pr) - (r < pr)
+    dc = (c > pc) - (c < pc)
+
+    def blocked(r, c):
+        return not (0 <= r < rows and 0 <= c < cols) or flags[r * cols + c] & BLOCKED
+
+    if dr and dc:
+        dirs = [(dr, 0), (0, dc), (dr, dc)]
+        if blocked(r - dr, c): dirs.append((-dr, dc))
+        if blocked(r, c - dc): dirs.append((dr, -dc))
+    elif dr:
+        dirs = [(dr, 0)]
+        if blocked(r, c + 1): dirs.append((dr, 1))
+        if blocked(r, c - 1): dirs.append((dr, -1))
+    else:
+        dirs = [(0, dc)]
+        if blocked(r + 1, c): dirs.append((1, dc))
+        if blocked(r - 1, c): dirs.append((-1, dc))
+    return dirs
+
+def _expand_jumps(grid, jump_points):
+    """Fills in the straight/diagonal runs between consecutive jump points."""
+    cols = grid.cols
+    path = [grid.node(jump_points[0])]
+    for a, b in zip(jump_points, jump_points[1:]):
+        ar, ac = divmod(a, cols)
+        br, bc = divmod(b, cols)
+        dr = (br > ar) - (br < ar)
+        dc = (bc > ac) - (bc < ac)
+        for _ in range(max(abs(br - ar), abs(bc - ac))):
+            ar += dr; ac += dc
+            path.append(grid.node(ar * cols + ac))
+    return path
+
+def jps(start, target, grid, draw, stats=None, hooks=None):
+    """
+    Jump Point Search: A* over jump points only, skipping runs of symmetric
+    cells on the uniform-cost 8-connected grid. Only jump points reach the
+    draw observer; the returned path is expanded back to every cell.
+    """
+    start_time = search_clock()
+    stats, on_expand, on_push = begin("JPS", stats, hooks)
+    gen = grid.reset()
+    node, parent, costs = grid.node, grid.parent, grid.cost
+    stamp, seen = grid.stamp, grid.seen
+    cols = grid.cols
+    s, t = start.idx, target.idx
+    tr, tc = divmod(t, cols)
+    count = 0
+    h = octile(s, t, cols)
+    pq = [(h, h, count, s)]
+    grid.touch(s)
+    costs[s] = 0
+    visited = 0
     
-    for n in curr.get_neighbors(grid):
-        if n not in visited:
-            n.parent = curr
-            res = dls(n, target, limit, grid, draw, depth + 1, visited, start_time)
-            if res: return res
-    return None
+    while pq:
+        if search_clock() - start_time > SEARCH_TIMEOUT:
+            print("JPS: Search timed out!")
+            return stats.finish("timeout")
+            
+        _, _, _, curr = heapq.heappop(pq)
+        if seen[curr] == gen: continue
+        seen[curr] = gen
+        visited += 1
+        
+        if curr == t:
+            jump_points = []
+            while curr != -1:
+                jump_points.append(curr)
+                curr = grid.get_parent(curr)
+            return stats.finish("found", _expand_jumps(grid, jump_points[::-1]))
+        stats.expansions += 1
+        if on_expand: on_expand(curr)
+        
+        r, c = divmod(curr, cols)
+        for dr, dc in _jps_directions(grid, curr, grid.get_parent(curr)):
+            n = _jump(grid, r, c, dr, dc, tr, tc)
+            if n == -1 or seen[n] == gen: continue
+            new_cost = costs[curr] + octile(curr, n, cols)
+            if stamp[n] != gen or new_cost < costs[n]:
+                if stamp[n] == gen: stats.repushes += 1
+                stamp[n] = gen
+                costs[n] = new_cost
+                parent[n] = curr
+                count += 1
+                h = octile(n, t, cols)
+                heapq.heappush(pq, (new_cost + h, h, count, n))
+                stats.pushes += 1
+                if on_push: on_push(n)
+                if draw(node(n), "FRONTIER", len(pq), visited) == "BREAK":
+                    return stats.finish("break")
+        
+        if len(pq) > stats.peak_frontier: stats.peak_frontier = len(pq)
+        if draw(node(curr), "EXPLORED", len(pq), visited) == "BREAK":
+            return stats.finish("break")
+            
+        spawn_dynamic(grid)
+    return stats.finish("no_path")
 
-def iddfs(start, target, grid, draw):
-    """Iterative Deepening DFS: Gradually increases DLS depth."""
-    start_time = time.time()
-    MAX_IDDFS_DEPTH = 300 
+class _CountingDraw:
+    """
+    Wraps a draw observer so planners that live outside this module still
+    fill in SearchStats from the events they report.
+    """
+    def __init__(self, draw, stats, on_expand, on_push):
+        self.draw, self.stats = draw, stats
+        self.on_expand, self.on_push = on_expand, on_push
+        self.broke = False
+
+    def __call__(self, node, color_key=None, frontier_val=0, explored_val=0):
+        stats = self.stats
+        if color_key == "EXPLORED":
+            stats.expansions += 1
+            if self.on_expand: self.on_expand(node.idx)
+        elif color_key == "FRONTIER":
+            stats.pushes += 1
+            if self.on_push: self.on_push(node.idx)
+        elif node is None:
+            # Flow field wavefront: explored_val is the running total
+            stats.expansions = explored_val
+        if frontier_val > stats.peak_frontier: stats.peak_frontier = frontier_val
+        if self.draw(node, color_key, frontier_val, explored_val) == "BREAK":
+            self.broke = True
+            return "BREAK"
+
+    def finish(self, path, start_time):
+        if path: return self.stats.finish("found", path)
+        if self.broke: return self.stats.finish("break")
+        if search_clock() - start_time > SEARCH_TIMEOUT: return self.stats.finish("timeout")
+        return self.stats.finish("no_path")
+
+def dstar_lite(start, target, grid, draw, stats=None, hooks=None):
+    """
+    D* Lite: one-shot run of the incremental planner. The App keeps a
+    DStarLite alive across moves instead, so replans only repair changes.
+    """
+    start_time = search_clock()
+    counted = _CountingDraw(draw, *begin("D* Lite", stats, hooks))
+    planner = DStarLite(grid, start.idx, target.idx, SEARCH_TIMEOUT)
+    try:
+        return counted.finish(planner.plan(start.idx, counted), start_time)
+    finally:
+        planner.close()
+
+def flow_field(start, target, grid, draw, stats=None, hooks=None):
+    """
+    Flow Field: vectorized distance transform from the target, then follows
+    the resulting next-step field from start. Draw is called per wavefront.
+    Like HPA*, it runs on a static map and never calls spawn_dynamic.
+    """
+    # NumPy is only needed for this mode
+    from flowfield import FlowField
+    start_time = search_clock()
+    counted = _CountingDraw(draw, *begin("Flow Field", stats, hooks))
+    field = FlowField.build(grid, target.idx, counted)
+    return counted.finish(field.path(start.idx) if field else None, start_time)
+
+def hpa(start, target, grid, draw, stats=None, hooks=None):
+    """
+    HPA*: A* over the grid's cluster/entrance abstraction, then refinement
+    inside the clusters on the route. The abstraction is built once per grid
+    and only dirty clusters are rebuilt after wall/obstacle changes.
+    Only abstract nodes reach the draw observer. HPA* runs on a static map:
+    it never calls spawn_dynamic, since a spawn mid-query would invalidate
+    the very abstraction being searched.
+    """
+    start_time = search_clock()
+    counted = _CountingDraw(draw, *begin("HPA*", stats, hooks))
+    cells = HPAGraph.for_grid(grid).find_path(start.idx, target.idx, counted, start_time + SEARCH_TIMEOUT)
+    if cells == "TIMEOUT":
+        print("HPA*: Search timed out!")
+        return counted.stats.finish("timeout")
+    if cells is None or cells == "BREAK":
+        return counted.finish(None, start_time)
+    return counted.finish([grid.node(i) for i in cells], start_time)
+
+def _deepen(s, t, grid, draw, bound, heuristic, best, stats, on_expand, on_push, start_time):
+    """
+    One bounded depth-first pass from s on an explicit stack, cutting off
+    depth (or depth + octile distance with `heuristic`) above `bound`.
+    Returns (path / None / "BREAK" / "TIMEOUT", smallest value cut off).
+    """
+    gen = grid.reset()
+    node, parent, costs, stamp = grid.node, grid.parent, grid.cost, grid.stamp
+    links, steps = grid.links, grid.steps
+    cols = grid.cols
+    tr, tc = divmod(t, cols)
+    grid.touch(s)
+    costs[s] = 0
+    if s == t: return reconstruct_path(node(t)), None
+    stack = [(s, 0)]
+    next_bound = None
+    expanded = 0
     
-    for limit in range(1, MAX_IDDFS_DEPTH):
-        if time.time() - start_time > SEARCH_TIMEOUT:
-            print("IDDFS: Search timed out!")
-            return None
+    while stack:
+        if search_clock() - start_time > SEARCH_TIMEOUT:
+            return "TIMEOUT", None
             
-        for row in grid:
-            for node in row: node.reset()
+        curr, depth = stack.pop()
+        # Stale entry: reached again by a shorter route after it was pushed
+        if costs[curr] != depth: continue
+        expanded += 1
+        stats.expansions += 1
+        if on_expand: on_expand(curr)
         
-        res = dls(start, target, limit, grid, draw, 0, set(), start_time)
+        if draw(node(curr), "EXPLORED", depth, expanded) == "BREAK":
+            return "BREAK", None
         
-        if res == "TIMEOUT" or res == "BREAK":
-            return None
-        if res:
-            return res
+        new_depth = depth + 1
+        for d in steps[links[curr]]:
+            n = curr + d
+            # grid.cost holds the best depth per cell this pass and `best` across
+            # passes, so only strictly shorter routes are expanded again
+            known = stamp[n] == gen
+            if known and costs[n] <= new_depth or new_depth > best[n]: continue
+            f = new_depth
+            if heuristic:
+                nr, nc = divmod(n, cols)
+                f += max(abs(nr - tr), abs(nc - tc))
+            if f > bound:
+                if next_bound is None or f < next_bound: next_bound = f
+                continue
+            if known: stats.repushes += 1
+            stamp[n] = gen
+            costs[n] = new_depth
+            parent[n] = curr
+            best[n] = new_depth
+            if n == t: return reconstruct_path(node(t)), None
+            stack.append((n, new_depth))
+            stats.pushes += 1
+            if on_push: on_push(n)
         
-    print("IDDFS: Max depth reached.")
-    return None
+        if len(stack) > stats.peak_frontier: stats.peak_frontier = len(stack)
+    return None, next_bound
+
+def dls(start, target, limit, grid, draw, stats=None, hooks=None):
+    """Depth-Limited Search: DFS that never goes deeper than `limit` moves."""
+    start_time = search_clock()
+    stats, on_expand, on_push = begin("DLS", stats, hooks)
+    best = array('i', [COST_INF]) * grid.size
+    res, _ = _deepen(start.idx, target.idx, grid, draw, limit, False, best, stats, on_expand, on_push, start_time)
+    if res == "TIMEOUT":
+        print("DLS: Search timed out!")
+        return stats.finish("timeout")
+    if res == "BREAK":
+        return stats.finish("break")
+    return stats.finish("found", res) if res else stats.finish("no_path")
+
+def _iterative_deepening(name, start, target, grid, draw, heuristic, stats, hooks):
+    """
+    Repeats _deepen with the bound raised to the smallest value the previous
+    pass cut off, starting at the octile distance (no shorter path exists).
+    Stops as soon as a pass cuts nothing off: the target is unreachable.
+    """
+    start_time = search_clock()
+    stats, on_expand, on_push = begin(name, stats, hooks)
+    s, t = start.idx, target.idx
+    bound = octile(s, t, grid.cols)
+    best = array('i', [COST_INF]) * grid.size
+    
+    while bound is not None:
+        res, bound = _deepen(s, t, grid, draw, bound, heuristic, best, stats, on_expand, on_push, start_time)
+        if res == "TIMEOUT":
+            print(f"{name}: Search timed out!")
+            return stats.finish("timeout")
+        if res == "BREAK":
+            return stats.finish("break")
+        if res:
+            return stats.finish("found", res)
+    return stats.finish("no_path")
+
+def iddfs(start, target, grid, draw, stats=None, hooks=None):
+    """Iterative Deepening DFS: Gradually increases DLS depth."""
+    return _iterative_deepening("IDDFS", start, target, grid, draw, False, stats, hooks)
 
-def bidirectional(start, target, grid, draw):
-    """Bidirectional Search: Searches from both start and target simultaneously."""
-    start_time = time.time()
-    f_q, b_q = deque([start]), deque([target])
-    f_vis, b_vis = {start: None}, {target: None}
+def ida_star(start, target, grid, draw, stats=None, hooks=None):
+    """IDA*: iterative deepening on depth + octile distance instead of depth alone."""
+    return _iterative_deepening("IDA*", start, target, grid, draw, True, stats, hooks)
+
+def bidirectional(start, target, grid, draw, stats=None, hooks=None):
+    """
+    Bidirectional Search: BFS from start and from target, always growing the
+    side with the smaller frontier by one whole layer. The layer in which the
+    two sides first touch is finished before stopping and its shortest
+    meeting route is returned, so the path is a shortest one.
+    """
+    start_time = search_clock()
+    stats, on_expand, on_push = begin("Bidirectional", stats, hooks)
+    node = grid.node
+    links, steps = grid.links, grid.steps
+    s, t = start.idx, target.idx
+    if s == t: return stats.finish("found", [start])
+    f_par, b_par = {s: -1}, {t: -1}
+    f_dist, b_dist = {s: 0}, {t: 0}
+    f_layer, b_layer = [s], [t]
+
+    def join(f_end, b_end):
+        """Stitches the forward chain ending at f_end to the backward chain from b_end."""
+        p1 = []
+        curr = f_end
+        while curr != -1:
+            p1.append(node(curr))
+            curr = f_par[curr]
+        p2 = []
+        curr = b_end
+        while curr != -1:
+            p2.append(node(curr))
+            curr = b_par[curr]
+        return stats.finish("found", p1[::-1] + p2)
     
-    while f_q and b_q:
-        if time.time() - start_time > SEARCH_TIMEOUT:
-            print("Bidirectional: Search timed out!")
-            return None
+    while f_layer and b_layer:
+        forward = len(f_layer) <= len(b_layer)
+        if forward:
+            layer, other, par, dist, o_dist = f_layer, b_layer, f_par, f_dist, b_dist
+        else:
+            layer, other, par, dist, o_dist = b_layer, f_layer, b_par, b_dist, f_dist
+        best, meet = None, None
+        next_layer = []
+        
+        for curr in layer:
+            if search_clock() - start_time > SEARCH_TIMEOUT:
+                print("Bidirectional: Search timed out!")
+                return stats.finish("timeout")
+            stats.expansions += 1
+            if on_expand: on_expand(curr)
             
-        # Forward Step
-        c_f = f_q.popleft()
-        for n in c_f.get_neighbors(grid):
-            if n in b_vis:
-                p1 = reconstruct_path(c_f)
-                p2 = []
-                curr = n
-                while curr: 
-                    p2.append(curr)
-                    curr = b_vis[curr]
-                return p1 + p2
-            if n not in f_vis:
-                f_vis[n] = c_f
-                f_q.append(n)
-                if draw(n, "FRONTIER", len(f_q), len(f_vis)) == "BREAK":
-                    return None
-        
-        # Backward Step
-        c_b = b_q.popleft()
-        for n in c_b.get_neighbors(grid):
-            if n in f_vis:
-                p1 = reconstruct_path(f_vis[n])
-                p2 = []
-                curr = c_b
-                while curr: 
-                    p2.append(curr)
-                    curr = b_vis[curr]
-                return p1 + p2
-            if n not in b_vis:
-                b_vis[n] = c_b
-                b_q.append(n)
-                if draw(n, "FRONTIER", len(b_q), len(b_vis)) == "BREAK":
-                    return None
-                    
+            new_dist = dist[curr] + 1
+            for d in steps[links[curr]]:
+                n = curr + d
+                if n in o_dist:
+                    length = new_dist + o_dist[n]
+                    if best is None or length < best:
+                        best, meet = length, (curr, n)
+                if n not in par:
+                    par[n] = curr
+                    dist[n] = new_dist
+                    next_layer.append(n)
+                    stats.pushes += 1
+                    if on_push: on_push(n)
+                    if draw(node(n), "FRONTIER", len(next_layer) + len(other), len(f_par) + len(b_par)) == "BREAK":
+                        return stats.finish("break")
+            
+            if draw(node(curr), "EXPLORED", len(next_layer) + len(other), len(f_par) + len(b_par)) == "BREAK":
+                return stats.finish("break")
+            spawn_dynamic(grid)
+        
+        if meet:
+            curr, n = meet
+            return join(curr, n) if forward else join(n, curr)
+        if forward: f_layer = next_layer
+        else: b_layer = next_layer
+        if len(f_layer) + len(b_layer) > stats.peak_frontier: stats.peak_frontier = len(f_layer) + len(b_layer)
+    return stats.finish("no_path")
+
+def bidirectional_astar(start, target, grid, draw, heuristic=True, stats=None, hooks=None):
+    """
+    Bidirectional A*: A* from start towards target and from target towards
+    start, expanding whichever side has the smaller open list. Every time
+    the two searches link up, the best route so far (mu) is updated. The
+    search stops once the cheapest open f of either side reaches mu (for
+    UCS, once the two cheapest costs add up to mu), so the route is optimal.
+    """
+    start_time = search_clock()
+    stats, on_expand, on_push = begin("Bidirectional A*" if heuristic else "Bidirectional UCS", stats, hooks)
+    node = grid.node
+    links, steps = grid.links, grid.steps
+    cols = grid.cols
+    s, t = start.idx, target.idx
+    g_f, g_b = {s: 0}, {t: 0}
+    par_f, par_b = {s: -1}, {t: -1}
+    closed_f, closed_b = set(), set()
+    h = octile(s, t, cols) if heuristic else 0
+    pq_f, pq_b = [(h, 0, s)], [(h, 0, t)]
+    count = 0
+    mu, meet = COST_INF, -1
+    if s == t: mu, meet = 0, s
+    
+    while pq_f and pq_b:
+        if search_clock() - start_time > SEARCH_TIMEOUT:
+            print("Bidirectional A*: Search timed out!")
+            return stats.finish("timeout")
+        # Neither side can improve on mu any more
+        if heuristic:
+            if max(pq_f[0][0], pq_b[0][0]) >= mu: break
+        elif pq_f[0][0] + pq_b[0][0] >= mu: break
+        
+        if len(pq_f) <= len(pq_b):
+            pq, g, par, closed, o_g, goal = pq_f, g_f, par_f, closed_f, g_b, t
+        else:
+            pq, g, par, closed, o_g, goal = pq_b, g_b, par_b, closed_b, g_f, s
+        _, _, curr = heapq.heappop(pq)
+        if curr in closed: continue
+        closed.add(curr)
+        stats.expansions += 1
+        if on_expand: on_expand(curr)
+        
+        gr, gc = divmod(goal, cols)
+        new_g = g[curr] + 1
+        for d in steps[links[curr]]:
+            n = curr + d
+            if new_g < g.get(n, COST_INF):
+                if n in g: stats.repushes += 1
+                g[n] = new_g
+                par[n] = curr
+                if n in o_g and new_g + o_g[n] < mu:
+                    mu, meet = new_g + o_g[n], n
+                f = new_g
+                if heuristic:
+                    nr, nc = divmod(n, cols)
+                    f += max(abs(nr - gr), abs(nc - gc))
+                count += 1
+                heapq.heappush(pq, (f, count, n))
+                stats.pushes += 1
+                if on_push: on_push(n)
+                if draw(node(n), "FRONTIER", len(pq_f) + len(pq_b), len(closed_f) + len(closed_b)) == "BREAK":
+                    return stats.finish("break")
+        
+        if len(pq_f) + len(pq_b) > stats.peak_frontier: stats.peak_frontier = len(pq_f) + len(pq_b)
+        if draw(node(curr), "EXPLORED", len(pq_f) + len(pq_b), len(closed_f) + len(closed_b)) == "BREAK":
+            return stats.finish("break")
         spawn_dynamic(grid)
-    return None
\ No newline at end of file
+    
+    if meet == -1:
+        return stats.finish("no_path")
+    path = []
+    curr = meet
+    while curr != -1:
+        path.append(node(curr))
+        curr = par_f[curr]
+    path.reverse()
+    curr = par_b[meet]
+    while curr != -1:
+        path.append(node(curr))
+        curr = par_b[curr]
+    return stats.finish("found", path)
+
+def bidirectional_ucs(start, target, grid, draw, stats=None, hooks=None):
+    """Bidirectional UCS: bidirectional A* without the heuristic."""
+    return bidirectional_astar(start, target, grid, draw, heuristic=False, stats=stats, hooks=hooks)
+
+# Registry used by the App menu and the headless entry points
+ALGORITHMS = {
+    "BFS": bfs,
+    "DFS": dfs,
+    "UCS": ucs,
+    "DLS": dls,
+    "IDDFS": iddfs,
+    "IDA_STAR": ida_star,
+    "BIDIRECTIONAL": bidirectional,
+    "BIDIRECTIONAL_UCS": bidirectional_ucs,
+    "BIDIRECTIONAL_ASTAR": bidirectional_astar,
+    "ASTAR": astar,
+    "WEIGHTED_ASTAR": weighted_astar,
+    "JPS": jps,
+    "DSTAR_LITE": dstar_lite,
+    "FLOW_FIELD": flow_field,
+    "HPA": hpa
+}
+
+def run_search(name, start, target, grid, draw=null_draw, limit=DLS_DEPTH_LIMIT, stats=None, hooks=None):
+    """
+    Runs the algorithm registered under `name`, hiding the DLS signature quirk.
+    Returns the path (list of Nodes) or None; pass a SearchStats as `stats`
+    to get the run's counters, and a SearchHooks as `hooks` to instrument it.
+    """
+    algo_func = ALGORITHMS[name.upper()]
+    if algo_func is dls:
+        return dls(start, target, limit, grid, draw, stats, hooks)
+    return algo_func(start, target, grid, draw, stats=stats, hooks=hooks)
+
+def run_search_stats(name, start, target, grid, draw=null_draw, limit=DLS_DEPTH_LIMIT, hooks=None):
+    """Like run_search but returns (path, SearchStats)."""
+    stats = SearchStats()
+    path = run_search(name, start, target, grid, draw, limit, stats, hooks)
+    return path, stats
@@ -0,0 +1,235 @@
+"""
+Batch solving of many queries against one map, in parallel and headless.
+
+    python batch.py --map arena.map --scen arena.map.scen --algos ASTAR,JPS > out.ndjson
+    python batch.py --style maze --rows 200 --cols 200 --seed 4 --random 1000 --workers 8
+    python batch.py --map den.map --queries pairs.txt --dynamic-rate 0.02 --dynamic-seed 7
+
+Results stream out as one JSON object per line (or a JSON array with
+--format json) in query order: id, algo, start, target, status, path,
+cost, expansions and time. Queries are read lazily and only a few chunks
+are in flight at a time, so memory stays flat however many there are.
+"""
+import argparse
+import contextlib
+import itertools
+import json
+import os
+import random
+import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from grid_elements import Grid, BLOCKED
+import algorithm
+import mapgen
+import movingai
+
+# Per-process state set up by _attach() in every pool worker
+_worker = {}
+
+def _setup(grid, algos, timeout, dynamic_rate, dynamic_seed):
+    _worker["grid"] = grid
+    _worker["algos"] = algos
+    _worker["dynamic"] = (dynamic_rate, dynamic_seed)
+    if timeout is not None:
+        algorithm.SEARCH_TIMEOUT = timeout
+
+def _attach(flags_name, links_name, rows, cols, algos, timeout, dynamic_rate, dynamic_seed):
+    """Pool initializer: maps the shared map into a private, read-only Grid."""
+    flags_shm = shared_memory.SharedMemory(name=flags_name)
+    links_shm = shared_memory.SharedMemory(name=links_name)
+    size = rows * cols
+    # Keep the SharedMemory objects alive for as long as the grid uses their buffers
+    _worker["shm"] = (flags_shm, links_shm)
+    # Searches print timeouts; keep stdout free for the parent's results
+    sys.stdout = sys.stderr
+    grid = Grid(rows, cols, flags=flags_shm.buf[:size], links=links_shm.buf[:size], dynamic_rate=0)
+    _setup(grid, algos, timeout, dynamic_rate, dynamic_seed)
+
+def _solve_one(grid, algo, qid, start, target):
+    dynamic_rate, dynamic_seed = _worker.get("dynamic", (0, 0))
+    if dynamic_rate:
+        # Spawns change the map, so every search gets its own copy, seeded by
+        # query id so results do not depend on which worker ran them
+        grid = Grid(grid.rows, grid.cols, flags=bytearray(grid.flags), links=bytearray(grid.links),
+                    dynamic_rate=dynamic_rate, dynamic_seed=dynamic_seed + qid)
+    path, stats = algorithm.run_search_stats(algo, grid.node(grid.index(*start)),
+                                             grid.node(grid.index(*target)), grid)
+    return {
+        "id": qid,
+        "algo": algo,
+        "start": start,
+        "target": target,
+        "status": stats.status,
+        "path": [(n.r, n.c) for n in path] if path else None,
+        "length": len(path) if path else 0,
+        "cost": len(path) - 1 if path else None,
+        "expansions": stats.expansions,
+        "time": stats.time
+    }
+
+def _solve_chunk(chunk):
+    grid, algos = _worker["grid"], _worker["algos"]
+    return [_solve_one(grid, algo, qid, start, target) for qid, start, target in chunk for algo in algos]
+
+def iter_solve(grid, queries, algos=("ASTAR",), workers=None, chunk_size=64, timeout=None,
+               dynamic_rate=0, dynamic_seed=0):
+    """
+    Yields one result dict per (query, algorithm), in input order (path as
+    (r, c) tuples, cost in moves, expansions, time and the search status).
+    `queries` may be any iterable of (start, target) pairs and is consumed
+    lazily. Queries are spread over a process pool whose workers all read a
+    single shared-memory copy of the walls and neighbor masks; each worker
+    keeps its own search arrays, so nothing is shared mutably.
+    With a dynamic_rate, each search runs on a private copy of the map whose
+    spawn schedule is seeded with dynamic_seed + the query's index.
+    workers=1 runs everything in this process.
+    """
+    algos = tuple(algos)
+    workers = workers or os.cpu_count() or 1
+    numbered = ((qid, tuple(s), tuple(t)) for qid, (s, t) in enumerate(queries))
+    chunks = iter(lambda: list(itertools.islice(numbered, chunk_size)), [])
+
+    if workers == 1:
+        local = Grid(grid.rows, grid.cols, flags=grid.flags, links=grid.links, dynamic_rate=0)
+        saved = algorithm.SEARCH_TIMEOUT
+        _setup(local, algos, timeout, dynamic_rate, dynamic_seed)
+        try:
+            for chunk in chunks:
+                yield from _solve_chunk(chunk)
+        finally:
+            algorithm.SEARCH_TIMEOUT = saved
+            _worker.clear()
+        return
+
+    size = grid.size
+    flags_shm = shared_memory.SharedMemory(create=True, size=max(1, size))
+    links_shm = shared_memory.SharedMemory(create=True, size=max(1, size))
+    try:
+        flags_shm.buf[:size] = grid.flags
+        links_shm.buf[:size] = grid.links
+        with ProcessPoolExecutor(max_workers=workers, initializer=_attach,
+                                 initargs=(flags_shm.name, links_shm.name, grid.rows, grid.cols,
+                                           algos, timeout, dynamic_rate, dynamic_seed)) as pool:
+            # A couple of chunks per worker in flight, collected in submission order
+            pending = deque()
+            for chunk in chunks:
+                pending.append(pool.submit(_solve_chunk, chunk))
+                if len(pending) >= 2 * workers:
+                    yield from pending.popleft().result()
+            while pending:
+                yield from pending.popleft().result()
+    finally:
+        flags_shm.close()
+        flags_shm.unlink()
+        links_shm.close()
+        links_shm.unlink()
+
+def batch_solve(grid, queries, algo="ASTAR", workers=None, chunk_size=64):
+    """
+    Answers many (start, target) queries against one map with one algorithm
+    and returns the result dicts of iter_solve() as a list, in input order.
+    Dynamic obstacles are not spawned during batch runs.
+    """
+    return list(iter_solve(grid, queries, (algo,), workers, chunk_size))
+
+# --- Command line ---
+def read_queries(filename):
+    """
+    Yields (start, target) pairs from a MovingAI .scen file or from a text
+    file of "r1 c1 r2 c2" lines (commas allowed, '#' starts a comment).
+    """
+    if filename.endswith(".scen"):
+        for q in movingai.load_scen(filename):
+            yield q["start"], q["target"]
+        return
+    with open(filename) as f:
+        for line in f:
+            fields = line.split("#")[0].replace(",", " ").split()
+            if fields:
+                r1, c1, r2, c2 = map(int, fields)
+                yield (r1, c1), (r2, c2)
+
+def random_queries(grid, count, seed=0):
+    """Yields `count` seeded pairs of distinct free cells."""
+    rng = random.Random(seed)
+    free = [i for i in range(grid.size) if not grid.flags[i] & BLOCKED]
+    if len(free) < 2:
+        return
+    for _ in range(count):
+        s, t = rng.sample(free, 2)
+        yield divmod(s, grid.cols), divmod(t, grid.cols)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Solve many pathfinding queries headlessly, streaming JSON results.")
+    source = parser.add_argument_group("map (a .map file, or a generated one)")
+    source.add_argument("--map", help="MovingAI .map file")
+    source.add_argument("--style", choices=sorted(mapgen.STYLES), default="random")
+    source.add_argument("--rows", type=int, default=100)
+    source.add_argument("--cols", type=int, default=100)
+    source.add_argument("--density", type=float, default=0.25)
+    source.add_argument("--seed", type=int, default=0, help="map seed (also seeds --random)")
+    queries = parser.add_argument_group("queries (default: corner to corner)")
+    queries.add_argument("--scen", help="MovingAI .scen file")
+    queries.add_argument("--queries", help="text file of 'r1 c1 r2 c2' lines")
+    queries.add_argument("--random", type=int, metavar="N", help="N random free-cell pairs")
+    parser.add_argument("--algos", default="ASTAR", help="comma-separated algorithm names")
+    parser.add_argument("--timeout", type=float, default=algorithm.SEARCH_TIMEOUT, help="per-search timeout in seconds")
+    parser.add_argument("--workers", type=int, default=1, help="worker processes (0 = one per CPU)")
+    parser.add_argument("--chunk-size", type=int, default=64)
+    parser.add_argument("--dynamic-rate", type=float, default=0, help="per-step obstacle spawn chance")
+    parser.add_argument("--dynamic-seed", type=int, default=0)
+    parser.add_argument("--format", choices=["ndjson", "json"], default="ndjson")
+    parser.add_argument("--no-paths", action="store_true", help="leave the cell lists out of the output")
+    parser.add_argument("--out", help="output file (default: stdout)")
+    args = parser.parse_args(argv)
+
+    algos = [a.upper() for a in args.algos.split(",") if a]
+    unknown = [a for a in algos if a not in algorithm.ALGORITHMS]
+    if unknown:
+        parser.error(f"unknown algorithm(s): {', '.join(unknown)}")
+
+    if args.map:
+        grid = movingai.load_map(args.map)
+    else:
+        grid = mapgen.generate(args.style, args.rows, args.cols, args.density, args.seed)
+
+    if args.scen:
+        pairs = read_queries(args.scen)
+    elif args.queries:
+        pairs = read_queries(args.queries)
+    elif args.random:
+        pairs = random_queries(grid, args.random, args.seed)
+    else:
+        s, t = mapgen.endpoints(grid)
+        pairs = [(divmod(s, grid.cols), divmod(t, grid.cols))] if s is not None else []
+
+    out = open(args.out, "w") if args.out else sys.stdout
+    timeouts = 0
+    try:
+        # Timeout messages go to stderr so stdout stays valid NDJSON
+        with contextlib.redirect_stdout(sys.stderr):
+            if args.format == "json":
+                out.write("[")
+            results = iter_solve(grid, pairs, algos, args.workers or None, args.chunk_size,
+                                 args.timeout, args.dynamic_rate, args.dynamic_seed)
+            for n, res in enumerate(results):
+                if args.no_paths:
+                    del res["path"]
+                timeouts += res["status"] == "timeout"
+                line = json.dumps(res)
+                if args.format == "json":
+                    line = (",\n " if n else "\n ") + line
+                else:
+                    line += "\n"
+                out.write(line)
+            if args.format == "json":
+                out.write("\n]\n")
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    return 1 if timeouts else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,169 @@
+"""
+Reproducible benchmark suite for the searches in algorithm.py.
+
+    python benchmark.py run --out bench.json
+    python benchmark.py run --sizes 40,80 --styles random,maze --out new.json
+    python benchmark.py compare bench.json new.json
+
+Every run is headless, on generated maps with dynamic obstacles turned off
+by default, so the same arguments always explore the same cells. With
+--dynamic-rate each run gets a fresh copy of the map whose seeded spawn
+schedule (the map seed) replays the same obstacles every time.
+
+    python benchmark.py run --dynamic-rate 0.02 --algos ASTAR,DSTAR_LITE
+"""
+import argparse
+import json
+import platform
+import sys
+import time
+import tracemalloc
+from grid_elements import Grid
+import algorithm
+import mapgen
+
+DEFAULT_ALGOS = ["BFS", "DFS", "UCS", "DLS", "IDDFS", "BIDIRECTIONAL"]
+
+def run_case(algo, grid, s, t, repeat=1, dynamic_rate=0, dynamic_seed=0):
+    """
+    Best-of-`repeat` search stats plus one traced run for peak memory.
+    With a dynamic_rate every run starts from an untouched copy of the map,
+    since spawned obstacles stay on the grid.
+    """
+    def fresh():
+        if not dynamic_rate:
+            return grid
+        return Grid(grid.rows, grid.cols, flags=bytearray(grid.flags), links=bytearray(grid.links),
+                    dynamic_rate=dynamic_rate, dynamic_seed=dynamic_seed)
+
+    best = None
+    for _ in range(repeat):
+        g = fresh()
+        _, stats = algorithm.run_search_stats(algo, g.node(s), g.node(t), g)
+        if best is None or stats.time < best.time:
+            best = stats
+
+    g = fresh()
+    tracemalloc.start()
+    algorithm.run_search(algo, g.node(s), g.node(t), g)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "time": best.time,
+        "expansions": best.expansions,
+        "pushes": best.pushes,
+        "repushes": best.repushes,
+        "peak_frontier": best.peak_frontier,
+        "peak_memory": peak,
+        "path_length": best.path_length,
+        "status": best.status
+    }
+
+def case_key(result):
+    return (result["algo"], result["style"], result["rows"], result["cols"],
+            result["density"], result["seed"], result.get("dynamic_rate", 0))
+
+def run_suite(algos, sizes, densities, styles, seeds, repeat=1, dynamic_rate=0, log=sys.stderr):
+    results = []
+    for style in styles:
+        for size in sizes:
+            for density in densities:
+                for seed in seeds:
+                    grid = mapgen.generate(style, size, size, density, seed)
+                    s, t = mapgen.endpoints(grid)
+                    if s is None:
+                        continue
+                    for algo in algos:
+                        res = {"algo": algo, "style": style, "rows": size, "cols": size,
+                               "density": density, "seed": seed, "dynamic_rate": dynamic_rate}
+                        res.update(run_case(algo, grid, s, t, repeat, dynamic_rate, seed))
+                        results.append(res)
+                        print(f"{algo:>14} {style:>6} {size:>5} d={density:<4} seed={seed} "
+                              f"{res['time'] * 1000:9.2f} ms  exp={res['expansions']} push={res['pushes']} {res['status']}", file=log)
+    return results
+
+def compare(baseline, current, tolerance=0.10, min_delta=0.001):
+    """
+    Lists regressions of `current` against `baseline` (both result lists):
+    slower by more than `tolerance` (and `min_delta` seconds), more
+    expansions or pushes, or a different path length.
+    """
+    base = {case_key(r): r for r in baseline}
+    regressions = []
+    for r in current:
+        b = base.get(case_key(r))
+        if b is None:
+            continue
+        if r["time"] > b["time"] * (1 + tolerance) and r["time"] - b["time"] > min_delta:
+            regressions.append((r, "time", b["time"], r["time"]))
+        for metric in ("expansions", "pushes"):
+            if r[metric] > b[metric]:
+                regressions.append((r, metric, b[metric], r[metric]))
+        if r["path_length"] != b["path_length"]:
+            regressions.append((r, "path_length", b["path_length"], r["path_length"]))
+    return regressions
+
+def _csv(cast):
+    return lambda text: [cast(x) for x in text.split(",") if x]
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the pathfinding algorithms headlessly.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    run = sub.add_parser("run", help="run the suite and write JSON")
+    run.add_argument("--algos", type=_csv(str), default=DEFAULT_ALGOS)
+    run.add_argument("--sizes", type=_csv(int), default=[20, 40, 80])
+    run.add_argument("--densities", type=_csv(float), default=[0.0, 0.2, 0.35])
+    run.add_argument("--styles", type=_csv(str), default=["random", "maze", "rooms"])
+    run.add_argument("--seeds", type=_csv(int), default=[1, 2, 3])
+    run.add_argument("--repeat", type=int, default=3, help="best-of-N timing")
+    run.add_argument("--timeout", type=float, default=2.0, help="per-search timeout in seconds")
+    run.add_argument("--dynamic-rate", type=float, default=0, help="per-step obstacle spawn chance")
+    run.add_argument("--out", default="bench_output.json")
+    run.add_argument("--baseline", help="compare against this JSON after running")
+    run.add_argument("--tolerance", type=float, default=0.10)
+
+    cmp_ = sub.add_parser("compare", help="flag regressions between two result files")
+    cmp_.add_argument("baseline")
+    cmp_.add_argument("current")
+    cmp_.add_argument("--tolerance", type=float, default=0.10)
+
+    args = parser.parse_args(argv)
+
+    if args.command == "run":
+        algorithm.SEARCH_TIMEOUT = args.timeout
+        results = run_suite([a.upper() for a in args.algos], args.sizes, args.densities,
+                            args.styles, args.seeds, args.repeat, args.dynamic_rate)
+        report = {
+            "meta": {
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                "timeout": args.timeout,
+                "repeat": args.repeat,
+                "dynamic_rate": args.dynamic_rate
+            },
+            "results": results
+        }
+        with open(args.out, "w") as f:
+            json.dump(report, f, indent=1)
+        if not args.baseline:
+            return 0
+        baseline_file, current = args.baseline, results
+    else:
+        baseline_file = args.baseline
+        with open(args.current) as f:
+            current = json.load(f)["results"]
+
+    with open(baseline_file) as f:
+        baseline = json.load(f)["results"]
+    regressions = compare(baseline, current, args.tolerance)
+    for r, metric, old, new in regressions:
+        print(f"REGRESSION {r['algo']} {r['style']} {r['rows']}x{r['cols']} d={r['density']} "
+              f"seed={r['seed']}: {metric} {old} -> {new}")
+    print(f"{len(regressions)} regression(s) in {len(current)} cases")
+    return 1 if regressions else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
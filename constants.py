@@ -1,5 +1,3 @@
-import pygame
-
 WIDTH, HEIGHT = 1100, 800
 GRID_SIZE = 20
 ROWS, COLS = 800 // GRID_SIZE, 800 // GRID_SIZE
@@ -18,5 +16,18 @@ COLORS = {
     "PATH": (52, 152, 219),
     "FRONTIER": (26, 188, 156),
     "EXPLORED": (241, 196, 15),
-    "DYNAMIC": (155, 89, 182)
-}
\ No newline at end of file
+    "DYNAMIC": (155, 89, 182),
+    "FIELD_NEAR": (255, 235, 130), # Distance-field overlay, close to the target
+    "FIELD_FAR": (70, 40, 110)     # Distance-field overlay, far from the target
+}
+
+# Search animation: each 60 FPS frame advances the search for at most
+# FRAME_BUDGET seconds and SPEED_LEVELS[speed] expansions (None = budget only)
+FRAME_BUDGET = 0.010
+SPEED_LEVELS = [1, 2, 5, 10, 25, 50, 100, 250, 1000, None]
+DEFAULT_SPEED = 4
+# Seconds between agent moves along a found path
+MOVE_DELAY = 0.03
+# Replan once an obstacle on the remaining path is this many steps ahead
+# of the agent (1 = the next cell, None = as soon as it appears)
+REPLAN_LOOKAHEAD = None
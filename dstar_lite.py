@@ -0,0 +1,170 @@
+import heapq
+from grid_elements import spawn_dynamic, BLOCKED, DIRECTIONS
+from metrics import search_clock
+
+INF = float('inf')
+
+class DStarLite:
+    """
+    Incremental planner (D* Lite) for one fixed goal on a Grid.
+    It searches backwards from the goal and keeps its g/rhs values between
+    calls, so after the agent moves or obstacles appear/disappear only the
+    affected part of the search is repaired. Blocked-state changes are picked
+    up through grid.watchers; call close() to detach when done.
+    """
+    def __init__(self, grid, start, goal, timeout=10):
+        self.grid = grid
+        self.start, self.goal = start, goal
+        self.timeout = timeout
+        self.g = {}
+        self.rhs = {goal: 0}
+        self.open = {}  # idx -> key currently valid in the heap
+        self.heap = []
+        self.km = 0
+        self.last_start = start
+        self.pending = set()
+        self.expansions = 0
+        self.push(goal, self.key(goal))
+        grid.watchers.append(self.on_change)
+
+    def close(self):
+        """Stops listening to grid changes."""
+        if self.on_change in self.grid.watchers:
+            self.grid.watchers.remove(self.on_change)
+
+    def on_change(self, idx):
+        self.pending.add(idx)
+
+    # --- Core D* Lite ---
+    def h(self, a, b):
+        cols = self.grid.cols
+        return max(abs(a // cols - b // cols), abs(a % cols - b % cols))
+
+    def key(self, u):
+        m = min(self.g.get(u, INF), self.rhs.get(u, INF))
+        return (m + self.h(self.start, u) + self.km, m)
+
+    def push(self, u, key):
+        self.open[u] = key
+        heapq.heappush(self.heap, (key, u))
+
+    def update_vertex(self, u):
+        grid = self.grid
+        if u != self.goal:
+            best = INF
+            # The agent's own cell may be blocked (an obstacle landed on it);
+            # it can still leave, like every other search allows
+            if u == self.start or not grid.flags[u] & BLOCKED:
+                g = self.g
+                for d in grid.steps[grid.links[u]]:
+                    cost = g.get(u + d, INF) + 1
+                    if cost < best: best = cost
+            self.rhs[u] = best
+        self.open.pop(u, None)
+        if self.g.get(u, INF) != self.rhs.get(u, INF):
+            self.push(u, self.key(u))
+
+    def top_key(self):
+        heap, open_ = self.heap, self.open
+        while heap and open_.get(heap[0][1]) != heap[0][0]:
+            heapq.heappop(heap)  # Stale entry
+        return heap[0][0] if heap else (INF, INF)
+
+    def compute_shortest_path(self, draw):
+        grid = self.grid
+        node = grid.node
+        g, rhs = self.g, self.rhs
+        cols = grid.cols
+        start = self.start
+        sr, sc = divmod(start, cols)
+        start_time = search_clock()
+        while self.top_key() < self.key(start) or \
+              rhs.get(start, INF) != g.get(start, INF):
+            if search_clock() - start_time > self.timeout:
+                print("D* Lite: Search timed out!")
+                return "TIMEOUT"
+            k_old, u = heapq.heappop(self.heap)
+            del self.open[u]
+            k_new = self.key(u)
+            if k_old < k_new:
+                self.push(u, k_new)
+                continue
+            self.expansions += 1
+            if g.get(u, INF) > rhs.get(u, INF):
+                g[u] = rhs[u]
+                affected = [u + d for d in grid.steps[grid.links[u]]]
+            else:
+                g[u] = INF
+                affected = [u + d for d in grid.steps[grid.links[u]]] + [u]
+            # links leave out blocked cells, so a blocked start never shows up
+            # among its neighbors' successors; find it by position instead
+            r, c = divmod(u, cols)
+            if abs(r - sr) <= 1 and abs(c - sc) <= 1 and start not in affected:
+                affected.append(start)
+            for p in affected:
+                self.update_vertex(p)
+                if p in self.open and draw(node(p), "FRONTIER", len(self.open), self.expansions) == "BREAK":
+                    return "BREAK"
+            if draw(node(u), "EXPLORED", len(self.open), self.expansions) == "BREAK":
+                return "BREAK"
+            spawn_dynamic(grid)
+        return None
+
+    def apply_changes(self):
+        """Repairs rhs values around every cell whose traversability changed."""
+        grid = self.grid
+        rows, cols = grid.rows, grid.cols
+        for idx in self.pending:
+            r, c = divmod(idx, cols)
+            self.update_vertex(idx)
+            # Neighbors that may have routed through (or can now route through) idx
+            for dr, dc in DIRECTIONS:
+                nr, nc = r + dr, c + dc
+                if 0 <= nr < rows and 0 <= nc < cols:
+                    self.update_vertex(nr * cols + nc)
+        self.pending.clear()
+
+    # --- Public API ---
+    def plan(self, start, draw):
+        """
+        Moves the agent to cell `start`, repairs the search after any grid
+        changes since the last call and returns the path as Nodes (or None).
+        """
+        if start != self.start:
+            self.km += self.h(self.last_start, start)
+            # Blocked cells are only passable as the start; re-check both
+            self.pending.update((self.start, start))
+            self.last_start = self.start = start
+        start_time = search_clock()
+        while True:
+            self.apply_changes()
+            if self.compute_shortest_path(draw):
+                return None
+            # Obstacles spawned during the search are still pending; repair them
+            # too, or extract_path would follow stale g-values into a dead end
+            if not self.pending:
+                return self.extract_path()
+            if search_clock() - start_time > self.timeout:
+                print("D* Lite: Search timed out!")
+                return None
+
+    def extract_path(self):
+        """Follows the cheapest successor from start to goal."""
+        grid, g = self.grid, self.g
+        if g.get(self.start, INF) == INF:
+            return None
+        curr = self.start
+        path = [grid.node(curr)]
+        for _ in range(grid.size):
+            if curr == self.goal:
+                return path
+            best, best_cost = -1, INF
+            for d in grid.steps[grid.links[curr]]:
+                cost = g.get(curr + d, INF)
+                if cost < best_cost:
+                    best, best_cost = curr + d, cost
+            if best == -1:
+                return None
+            curr = best
+            path.append(grid.node(curr))
+        return None
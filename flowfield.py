@@ -0,0 +1,104 @@
+import numpy as np
+from grid_elements import BLOCKED, DIRECTIONS
+
+def _shift_or(dst, src, dr, dc):
+    """dst[r + dr, c + dc] |= src[r, c] for every in-bounds pair, using whole-array slices."""
+    rows, cols = src.shape
+    dst[max(dr, 0):rows + min(dr, 0), max(dc, 0):cols + min(dc, 0)] |= \
+        src[max(-dr, 0):rows - max(dr, 0), max(-dc, 0):cols - max(dc, 0)]
+
+def distance_map(grid, target, draw=None):
+    """
+    Step distance from every cell to cell index `target` over the wall/dynamic
+    mask (-1 where unreachable). Each wavefront grows all 8 directions at once
+    with array shifts instead of popping cells one by one. `draw`, if given,
+    is called once per wavefront as draw(None, None, frontier, explored) and
+    may return "BREAK" to stop early (None is then returned). The map is
+    read once, so no obstacles are spawned while the field is built.
+    """
+    rows, cols = grid.rows, grid.cols
+    free = (np.frombuffer(grid.flags, dtype=np.uint8).reshape(rows, cols) & BLOCKED) == 0
+    dist = np.full((rows, cols), -1, dtype=np.int32)
+    frontier = np.zeros((rows, cols), dtype=bool)
+    tr, tc = divmod(target, cols)
+    frontier[tr, tc] = True
+    dist[tr, tc] = 0
+    reached = frontier.copy()
+    explored = 1
+    step = 0
+    while True:
+        step += 1
+        grown = np.zeros_like(frontier)
+        for dr, dc in DIRECTIONS:
+            _shift_or(grown, frontier, dr, dc)
+        grown &= free
+        grown &= ~reached
+        count = int(grown.sum())
+        if not count:
+            return dist
+        dist[grown] = step
+        reached |= grown
+        explored += count
+        frontier = grown
+        if draw and draw(None, None, count, explored) == "BREAK":
+            return None
+
+def next_steps(dist):
+    """
+    Flow field for a distance map: the index of the neighbor one step closer
+    to the target for every cell (-1 for the target and unreachable cells).
+    Ties go to the first neighbor in the clockwise DIRECTIONS order.
+    """
+    rows, cols = dist.shape
+    far = np.iinfo(np.int32).max
+    d = np.where(dist < 0, far, dist)
+    padded = np.pad(d, 1, constant_values=far)
+    candidates = np.stack([padded[1 + dr:1 + dr + rows, 1 + dc:1 + dc + cols] for dr, dc in DIRECTIONS])
+    best = candidates.argmin(axis=0)
+    best_dist = np.take_along_axis(candidates, best[None], axis=0)[0]
+
+    offsets = np.array([dr * cols + dc for dr, dc in DIRECTIONS], dtype=np.int64)
+    idx = np.arange(rows * cols, dtype=np.int64).reshape(rows, cols)
+    nxt = idx + offsets[best]
+    nxt[(dist <= 0) | (best_dist >= d)] = -1
+    return nxt.ravel()
+
+class FlowField:
+    """
+    Distance map and flow field towards one target, shared by any number of
+    agents: next_step(idx) is an O(1) lookup.
+    """
+    def __init__(self, grid, target, dist):
+        self.grid, self.target = grid, target
+        self.dist = dist
+        self.next = next_steps(dist)
+
+    @classmethod
+    def build(cls, grid, target, draw=None):
+        """Computes the field, or returns None if `draw` asked to break."""
+        dist = distance_map(grid, target, draw)
+        return cls(grid, target, dist) if dist is not None else None
+
+    def distance(self, idx):
+        return int(self.dist.flat[idx])
+
+    def next_step(self, idx):
+        return int(self.next[idx])
+
+    def path(self, start):
+        """Follows the field from cell `start`; returns Nodes or None if unreachable."""
+        path = [self.grid.node(start)]
+        curr = start
+        if curr != self.target and self.next[curr] == -1:
+            # A blocked start (an obstacle landed on the agent) has no distance
+            # of its own; leave it for the neighbor closest to the target
+            grid, dist = self.grid, self.dist.ravel()
+            reachable = [curr + d for d in grid.steps[grid.links[curr]] if dist[curr + d] >= 0]
+            if not reachable:
+                return None
+            curr = min(reachable, key=lambda i: dist[i])
+            path.append(grid.node(curr))
+        while curr != self.target:
+            curr = int(self.next[curr])
+            path.append(self.grid.node(curr))
+        return path
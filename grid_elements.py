@@ -1,31 +1,328 @@
-import pygame
+import math
 import random
-from constants import GRID_SIZE, ROWS, COLS, COLORS
+from array import array
+from constants import ROWS, COLS
+
+# Cell flag bits stored in Grid.flags
+WALL = 1
+DYNAMIC = 2
+BLOCKED = WALL | DYNAMIC
+
+# int32 sentinel used for "no cost yet" in Grid.cost
+COST_INF = 2**31 - 1
+
+# bytes.translate table: flag byte -> 1 if the cell is traversable, else 0
+FREE_BYTES = bytes(0 if f & BLOCKED else 1 for f in range(256))
+
+# STRICT CLOCKWISE expansion order including diagonals:
+# 1. Up, 2. Right, 3. Bottom, 4. Bottom-Right, 5. Left, 6. Top-Left,
+# 7. Top-Right, 8. Bottom-Left.
+DIRECTIONS = [
+    (-1, 0),  # 1. Up
+    (0, 1),   # 2. Right
+    (1, 0),   # 3. Bottom
+    (1, 1),   # 4. Bottom-Right (Diagonal)
+    (0, -1),  # 5. Left
+    (-1, -1), # 6. Top-Left (Diagonal)
+    (-1, 1),  # 7. Top-Right (Diagonal)
+    (1, -1)   # 8. Bottom-Left (Diagonal)
+]
+
+class SpawnSchedule:
+    """
+    Pre-generated dynamic-obstacle spawns for one (rate, seed) pair.
+    Entry i is (times[i], cells[i]): the search step on which the i-th
+    obstacle appears and the cell it lands on. Gaps between spawns are
+    drawn from the geometric distribution, which matches rolling
+    random() < rate once per step, but the RNG only runs once per spawn
+    and always from its own seed. Entries are generated in chunks as the
+    clock reaches them, so the schedule has no horizon.
+    """
+    CHUNK = 1024
+
+    def __init__(self, rate, seed, size):
+        self.rate, self.seed, self.size = rate, seed, size
+        self.rng = random.Random(seed)
+        self.times = array('q')
+        self.cells = array('i')
+        self.log_keep = math.log(1 - rate) if 0 < rate < 1 else None
+
+    def __getitem__(self, i):
+        while i >= len(self.times):
+            self._extend()
+        return self.times[i], self.cells[i]
+
+    def _extend(self):
+        rng, log_keep = self.rng, self.log_keep
+        t = self.times[-1] if self.times else 0
+        for _ in range(self.CHUNK):
+            # Steps until the next success of a per-step Bernoulli(rate) trial
+            t += 1 if log_keep is None else 1 + int(math.log(1.0 - rng.random()) / log_keep)
+            self.times.append(t)
+            self.cells.append(rng.randrange(self.size))
+
+class Grid:
+    """
+    A rows x cols map in flat typed arrays indexed by r * cols + c; grid[r][c]
+    still returns a Node. `flags`/`links` may be existing buffers (e.g. shared
+    memory) so several grids can read one map.
+    """
+    def __init__(self, rows=ROWS, cols=COLS, flags=None, links=None, dynamic_rate=0.02, dynamic_seed=0):
+        self.rows, self.cols = rows, cols
+        self.size = rows * cols
+        self.flags = flags if flags is not None else bytearray(self.size)
+        self.set_dynamic(dynamic_rate, dynamic_seed)
+        self.parent = array('i', [-1]) * self.size
+        self.cost = array('i', [COST_INF]) * self.size
+        self.stamp = array('i', [0]) * self.size
+        self.seen = array('i', [0]) * self.size
+        self.generation = 1
+        self.offsets = [dr * cols + dc for dr, dc in DIRECTIONS]
+        # links[idx] has bit k set when DIRECTIONS[k] leads to an in-bounds,
+        # traversable cell; steps[mask] holds the matching offsets in clockwise
+        # order, so hot loops run `for d in steps[links[idx]]` allocation-free
+        self.steps = [tuple(self.offsets[k] for k in range(8) if mask >> k & 1) for mask in range(256)]
+        if links is None:
+            self.links = self._build_links()
+            if flags is not None:
+                self._cut_blocked()
+        else:
+            self.links = links
+        self.watchers = []
+        self.version = 0
+        self.hpa = None # hpa.HPAGraph, built by the first HPA* query
+        self._rows = [GridRow(self, r) for r in range(rows)]
+
+    def set_dynamic(self, rate, seed=None):
+        """
+        Switches to a fresh SpawnSchedule (seed None keeps the current one)
+        and rewinds the clock. `rate` is the chance of a spawn per search step
+        (0 disables spawning); `clock` counts spawn_dynamic() calls and
+        next_spawn is the step of the next scheduled obstacle.
+        """
+        if seed is None:
+            seed = self.dynamic_seed
+        self.dynamic_seed = seed
+        self.schedule = SpawnSchedule(rate, seed, self.size) if rate > 0 else None
+        self.clock = 0
+        self.spawn_index = 0
+        self.next_spawn = self.schedule[0][0] if self.schedule else math.inf
+
+    @property
+    def dynamic_rate(self):
+        return self.schedule.rate if self.schedule else 0
+
+    @dynamic_rate.setter
+    def dynamic_rate(self, rate):
+        self.set_dynamic(rate)
+
+    def _bounds_mask(self, r, c):
+        mask = 0
+        for k, (dr, dc) in enumerate(DIRECTIONS):
+            if 0 <= r + dr < self.rows and 0 <= c + dc < self.cols:
+                mask |= 1 << k
+        return mask
+
+    def _build_links(self):
+        """Neighbor masks of an empty grid; every interior row shares one template."""
+        def row_links(r):
+            return bytes(self._bounds_mask(r, c) for c in range(self.cols))
+        if self.rows <= 3:
+            return bytearray(b''.join(row_links(r) for r in range(self.rows)))
+        return bytearray(row_links(0) + row_links(1) * (self.rows - 2) + row_links(self.rows - 1))
+
+    def __len__(self):
+        return self.rows
+
+    def __getitem__(self, r):
+        return self._rows[r]
+
+    def __iter__(self):
+        return iter(self._rows)
+
+    def index(self, r, c):
+        return r * self.cols + c
+
+    def node(self, idx):
+        """Returns a Node view of cell `idx`."""
+        return Node(self, idx)
+
+    def _cut_blocked(self):
+        """
+        Cuts every blocked cell out of its neighbors' masks in a few
+        whole-buffer passes (the per-cell _patch_links loop takes seconds on
+        a 1000x1000 map). The masks are handled as one big integer: for each
+        direction k, a byte per cell saying whether the cell k steps away is
+        free is shifted into bit k and the results are ANDed in.
+        """
+        size = self.size
+        free = bytes(self.flags).translate(FREE_BYTES)
+        reach = 0
+        for k, d in enumerate(self.offsets):
+            if d >= 0: shifted = (free + bytes(d))[d:d + size]
+            else: shifted = (bytes(-d) + free)[:size]
+            reach |= int.from_bytes(shifted, 'little') << k
+        self.links[:] = (int.from_bytes(self.links, 'little') & reach).to_bytes(size, 'little')
+
+    def set_flag(self, idx, bit, value=True):
+        """
+        Sets or clears a WALL/DYNAMIC bit and patches the neighbor masks of
+        the (at most 8) cells that can step onto `idx`. If the cell's
+        traversability flipped, `version` is bumped and every callable in
+        `watchers` is told `idx`. Flags must only be changed through here.
+        """
+        flags = self.flags
+        was_blocked = flags[idx] & BLOCKED
+        if value: flags[idx] |= bit
+        else: flags[idx] &= ~bit & 0xFF
+        blocked = flags[idx] & BLOCKED
+        if bool(was_blocked) == bool(blocked):
+            return
+        self._patch_links(idx, blocked)
+        self.version += 1
+        for watcher in self.watchers:
+            watcher(idx)
+
+    def _patch_links(self, idx, blocked):
+        r, c = divmod(idx, self.cols)
+        links = self.links
+        for k, (dr, dc) in enumerate(DIRECTIONS):
+            # The cell whose k-th neighbor is idx
+            nr, nc = r - dr, c - dc
+            if 0 <= nr < self.rows and 0 <= nc < self.cols:
+                j = nr * self.cols + nc
+                if blocked: links[j] &= ~(1 << k) & 0xFF
+                else: links[j] |= 1 << k
+
+    def reset(self):
+        """
+        Invalidates parent/cost/seen for every cell in O(1), keeping walls and
+        obstacles: entries only count while stamp[idx] (or seen[idx]) equals
+        the current generation, so bumping it clears them all.
+        """
+        self.generation += 1
+        if self.generation == COST_INF:
+            # int32 stamps are about to wrap: pay for one full clear
+            self.stamp[:] = array('i', [0]) * self.size
+            self.seen[:] = array('i', [0]) * self.size
+            self.generation = 1
+        return self.generation
+
+    def touch(self, idx):
+        """Brings a cell into the current generation with no parent and no cost."""
+        if self.stamp[idx] != self.generation:
+            self.stamp[idx] = self.generation
+            self.parent[idx] = -1
+            self.cost[idx] = COST_INF
+
+    def get_parent(self, idx):
+        return self.parent[idx] if self.stamp[idx] == self.generation else -1
+
+    def get_cost(self, idx):
+        return self.cost[idx] if self.stamp[idx] == self.generation else COST_INF
+
+    def neighbors(self, idx):
+        """Traversable neighbor indices of `idx` in the strict clockwise order."""
+        return [idx + d for d in self.steps[self.links[idx]]]
+
+class GridRow:
+    """One row of a Grid, so that grid[r][c] keeps working."""
+    __slots__ = ('grid', 'r')
+
+    def __init__(self, grid, r):
+        self.grid, self.r = grid, r
+
+    def __len__(self):
+        return self.grid.cols
+
+    def __getitem__(self, c):
+        if c < 0: c += self.grid.cols
+        if not 0 <= c < self.grid.cols:
+            raise IndexError(c)
+        return Node(self.grid, self.r * self.grid.cols + c)
+
+    def __iter__(self):
+        base = self.r * self.grid.cols
+        for idx in range(base, base + self.grid.cols):
+            yield Node(self.grid, idx)
 
 class Node:
-    def __init__(self, r, c):
-        self.r, self.c = r, c
-        self.parent = None
-        self.is_wall = False
-        self.is_dynamic = False
-        self.cost = float('inf')
+    """
+    Lightweight view of one grid cell. Views are created on demand, so two
+    views of the same cell compare (and hash) equal without being the same
+    object. All state lives in the owning Grid's arrays.
+    """
+    __slots__ = ('grid', 'idx')
+
+    def __init__(self, grid, idx):
+        self.grid, self.idx = grid, idx
+
+    @property
+    def r(self):
+        return self.idx // self.grid.cols
+
+    @property
+    def c(self):
+        return self.idx % self.grid.cols
+
+    @property
+    def is_wall(self):
+        return bool(self.grid.flags[self.idx] & WALL)
+
+    @is_wall.setter
+    def is_wall(self, value):
+        self.grid.set_flag(self.idx, WALL, value)
+
+    @property
+    def is_dynamic(self):
+        return bool(self.grid.flags[self.idx] & DYNAMIC)
+
+    @is_dynamic.setter
+    def is_dynamic(self, value):
+        self.grid.set_flag(self.idx, DYNAMIC, value)
+
+    @property
+    def parent(self):
+        p = self.grid.get_parent(self.idx)
+        return Node(self.grid, p) if p != -1 else None
+
+    @parent.setter
+    def parent(self, node):
+        self.grid.touch(self.idx)
+        self.grid.parent[self.idx] = node.idx if node is not None else -1
+
+    @property
+    def cost(self):
+        cost = self.grid.get_cost(self.idx)
+        return float('inf') if cost == COST_INF else cost
+
+    @cost.setter
+    def cost(self, value):
+        self.grid.touch(self.idx)
+        self.grid.cost[self.idx] = COST_INF if value == float('inf') else value
 
     def reset(self):
         """Resets search-specific data while keeping walls and obstacles."""
-        self.parent = None
-        self.cost = float('inf')
+        self.grid.stamp[self.idx] = 0
+        self.grid.seen[self.idx] = 0
 
     def draw(self, screen, color):
-        """Draws the node rectangle with a small offset for the grid effect."""
-        pygame.draw.rect(
-            screen, 
-            color, 
-            (self.c * GRID_SIZE, self.r * GRID_SIZE, GRID_SIZE - 1, GRID_SIZE - 1)
-        )
+        """Draws the node rectangle; pygame is only imported on first use."""
+        from renderer import draw_node
+        draw_node(screen, self, color)
+
+    def __eq__(self, other):
+        return isinstance(other, Node) and self.idx == other.idx and self.grid is other.grid
+
+    def __hash__(self):
+        return self.idx
+
+    def __repr__(self):
+        return f"Node({self.r}, {self.c})"
 
     def __lt__(self, other):
         """
-        Tie-breaker for priority queues (UCS). 
+        Tie-breaker for priority queues (UCS).
         Prevents TypeError when two nodes have the same cost.
         """
         if self.cost != other.cost:
@@ -34,43 +331,24 @@ class Node:
         return (self.r, self.c) < (other.r, other.c)
 
     def get_neighbors(self, grid):
-        """
-        Returns neighbors in the STRICT CLOCKWISE order including diagonals:
-        1. Up, 2. Right, 3. Bottom, 4. Bottom-Right, 5. Left, 6. Top-Left, 
-        7. Top-Right, 8. Bottom-Left.
-        """
-        directions = [
-            (-1, 0),  # 1. Up
-            (0, 1),   # 2. Right
-            (1, 0),   # 3. Bottom
-            (1, 1),   # 4. Bottom-Right (Diagonal)
-            (0, -1),  # 5. Left
-            (-1, -1), # 6. Top-Left (Diagonal)
-            (-1, 1),  # 7. Top-Right (Diagonal)
-            (1, -1)   # 8. Bottom-Left (Diagonal)
-        ]
-        
-        neighbors = []
-        for dr, dc in directions:
-            nr, nc = self.r + dr, self.c + dc
-            if 0 <= nr < ROWS and 0 <= nc < COLS:
-                node = grid[nr][nc]
-                # Only return traversable nodes
-                if not node.is_wall and not node.is_dynamic:
-                    neighbors.append(node)
-        return neighbors
+        """Returns traversable neighbors in the STRICT CLOCKWISE order (see DIRECTIONS)."""
+        return [Node(grid, self.idx + d) for d in grid.steps[grid.links[self.idx]]]
 
 def spawn_dynamic(grid):
     """
-    Spawns a dynamic obstacle based on a defined probability.
+    Advances the grid's obstacle clock by one search step and places any
+    obstacle its SpawnSchedule has due. Searches call this once per
+    expansion, so the common case is a single comparison.
     Required for the 'Dynamic Environment' task.
     """
-    # Probability: Define a small probability for a dynamic obstacle to spawn
-    probability = 0.02 
-    if random.random() < probability:
-        r, c = random.randint(0, ROWS - 1), random.randint(0, COLS - 1)
-        target_node = grid[r][c]
-        
-        # Do not spawn on existing obstacles or special points (handled in main.py)
-        if not target_node.is_wall and not target_node.is_dynamic:
-            target_node.is_dynamic = True
\ No newline at end of file
+    grid.clock += 1
+    if grid.clock < grid.next_spawn:
+        return
+    schedule = grid.schedule
+    idx = schedule.cells[grid.spawn_index]
+    grid.spawn_index += 1
+    grid.next_spawn = schedule[grid.spawn_index][0]
+
+    # Do not spawn on existing obstacles or special points (handled in main.py)
+    if not grid.flags[idx] & BLOCKED:
+        grid.set_flag(idx, DYNAMIC)
@@ -0,0 +1,47 @@
+from constants import ROWS, COLS
+from grid_elements import Grid
+import algorithm
+
+class BatchingObserver:
+    """
+    Wraps a real draw callback and only forwards every Nth event.
+    Useful to keep a window alive during a long search without paying
+    for a full repaint on every frontier push.
+    """
+    def __init__(self, draw, every=100):
+        self.draw = draw
+        self.every = max(1, every)
+        self.events = 0
+
+    def __call__(self, node, color_key=None, frontier_val=0, explored_val=0):
+        self.events += 1
+        if self.events % self.every == 0:
+            return self.draw(node, color_key, frontier_val, explored_val)
+        return None
+
+def build_grid(walls=(), rows=ROWS, cols=COLS):
+    """Creates a fresh rows x cols grid with the given (r, c) cells marked as walls."""
+    grid = Grid(rows, cols)
+    for r, c in walls:
+        grid[r][c].is_wall = True
+    return grid
+
+def solve(grid, start, target, algo="BFS", draw=None, limit=algorithm.DLS_DEPTH_LIMIT, cache=None):
+    """
+    Runs a search without any display and returns the path as a list of
+    (r, c) tuples, or None if no path was found.
+    `start` and `target` may be Node objects or (r, c) tuples. With a
+    pathcache.PathCache as `cache`, repeat queries skip the search.
+    """
+    if isinstance(start, tuple): start = grid[start[0]][start[1]]
+    if isinstance(target, tuple): target = grid[target[0]][target[1]]
+
+    grid.reset()
+
+    if cache is not None:
+        path = cache.solve(start, target, algo, draw or algorithm.null_draw, limit)
+    else:
+        path = algorithm.run_search(algo, start, target, grid, draw or algorithm.null_draw, limit)
+    if not path:
+        return None
+    return [(n.r, n.c) for n in path]
@@ -0,0 +1,264 @@
+import heapq
+from collections import deque
+from grid_elements import BLOCKED
+from metrics import search_clock
+
+# Side length (in cells) of one HPA* cluster
+CLUSTER_SIZE = 10
+
+class HPAGraph:
+    """
+    HPA* abstraction of a Grid: CLUSTER_SIZE squares linked through entrance
+    cells on their borders. One is kept per grid, in grid.hpa, and freed
+    with it; changes arrive through grid.watchers.
+    """
+    def __init__(self, grid, cluster_size=CLUSTER_SIZE):
+        self.grid = grid
+        self.size = cluster_size
+        self.crows = -(-grid.rows // cluster_size)
+        self.ccols = -(-grid.cols // cluster_size)
+        self.borders = {}  # (cluster a, cluster b) -> list of (cell in a, cell in b)
+        self.inter = {}    # abstract cell -> set of cells across a border
+        self.intra = {}    # cluster -> {abstract cell: [(abstract cell, cost)]}
+        self.dirty = set(range(self.crows * self.ccols))
+        self.rebuilds = 0
+        grid.watchers.append(self.on_change)
+
+    @classmethod
+    def for_grid(cls, grid):
+        if grid.hpa is None:
+            grid.hpa = cls(grid)
+        return grid.hpa
+
+    def close(self):
+        """Stops listening to grid changes."""
+        if self.on_change in self.grid.watchers:
+            self.grid.watchers.remove(self.on_change)
+        if self.grid.hpa is self:
+            self.grid.hpa = None
+
+    def on_change(self, idx):
+        self.dirty.add(self.cluster_of(idx))
+
+    # --- Geometry ---
+    def cluster_of(self, idx):
+        r, c = divmod(idx, self.grid.cols)
+        return (r // self.size) * self.ccols + c // self.size
+
+    def bounds(self, cid):
+        """(r0, r1, c0, c1), end-exclusive, of cluster `cid`."""
+        cr, cc = divmod(cid, self.ccols)
+        r0, c0 = cr * self.size, cc * self.size
+        return r0, min(r0 + self.size, self.grid.rows), c0, min(c0 + self.size, self.grid.cols)
+
+    def free(self, r, c):
+        grid = self.grid
+        return 0 <= r < grid.rows and 0 <= c < grid.cols and not grid.flags[r * grid.cols + c] & BLOCKED
+
+    def border_keys(self, cid):
+        """Keys of every border (including corners) cluster `cid` takes part in."""
+        cr, cc = divmod(cid, self.ccols)
+        keys = []
+        for dr in (-1, 0, 1):
+            for dc in (-1, 0, 1):
+                nr, nc = cr + dr, cc + dc
+                if (dr or dc) and 0 <= nr < self.crows and 0 <= nc < self.ccols:
+                    other = nr * self.ccols + nc
+                    keys.append((min(cid, other), max(cid, other)))
+        return keys
+
+    # --- Building ---
+    def build_border(self, key):
+        """
+        Recomputes the transitions between two touching clusters: one per
+        short run of open cells along the border, two for long runs, plus
+        purely diagonal and corner crossings.
+        """
+        a, b = key
+        ar, ac = divmod(a, self.ccols)
+        br, bc = divmod(b, self.ccols)
+        cols = self.grid.cols
+        free = self.free
+        pairs = []
+        if br == ar or bc == ac:
+            a0, a1, a2, a3 = self.bounds(a)
+            if br == ar:
+                # Vertical border: a on the left, b on the right
+                ca, cb = a3 - 1, a3
+                line = [((r, ca), (r, cb)) for r in range(a0, a1)]
+            else:
+                # Horizontal border: a above, b below
+                ra, rb = a1 - 1, a1
+                line = [((ra, c), (rb, c)) for c in range(a2, a3)]
+            run = []
+            for p, q in line + [(None, None)]:
+                if p is not None and free(*p) and free(*q):
+                    run.append((p, q))
+                    continue
+                if run:
+                    # Long runs get an entrance at each end, short ones in the middle
+                    picks = [run[0], run[-1]] if len(run) >= 6 else [run[len(run) // 2]]
+                    pairs.extend(picks)
+                    run = []
+            # Diagonal-only crossings (both orthogonal cells blocked)
+            for i in range(len(line) - 1):
+                (p0, q0), (p1, q1) = line[i], line[i + 1]
+                for p, q, o1, o2 in ((p0, q1, q0, p1), (p1, q0, q1, p0)):
+                    if free(*p) and free(*q) and not free(*o1) and not free(*o2):
+                        pairs.append((p, q))
+        else:
+            # Corner neighbors touch through a single diagonal step
+            a0, a1, a2, a3 = self.bounds(a)
+            if bc > ac: p, q = (a1 - 1, a3 - 1), (a1, a3)
+            else: p, q = (a1 - 1, a2), (a1, a2 - 1)
+            if free(*p) and free(*q):
+                pairs.append((p, q))
+
+        for u, v in self.borders.get(key, ()):
+            self.inter.get(u, set()).discard(v)
+            self.inter.get(v, set()).discard(u)
+        transitions = [(p[0] * cols + p[1], q[0] * cols + q[1]) for p, q in pairs]
+        self.borders[key] = transitions
+        for u, v in transitions:
+            self.inter.setdefault(u, set()).add(v)
+            self.inter.setdefault(v, set()).add(u)
+
+    def cluster_nodes(self, cid):
+        nodes = set()
+        for key in self.border_keys(cid):
+            for u, v in self.borders.get(key, ()):
+                if self.cluster_of(u) == cid: nodes.add(u)
+                if self.cluster_of(v) == cid: nodes.add(v)
+        return nodes
+
+    def local_bfs(self, source, cid):
+        """Unit-cost BFS from `source` restricted to cluster `cid`; returns {cell: (dist, parent)}."""
+        grid = self.grid
+        cols, links, steps = grid.cols, grid.links, grid.steps
+        r0, r1, c0, c1 = self.bounds(cid)
+        seen = {source: (0, -1)}
+        queue = deque([source])
+        while queue:
+            u = queue.popleft()
+            du = seen[u][0] + 1
+            for d in steps[links[u]]:
+                n = u + d
+                if n not in seen:
+                    r, c = divmod(n, cols)
+                    if r0 <= r < r1 and c0 <= c < c1:
+                        seen[n] = (du, u)
+                        queue.append(n)
+        return seen
+
+    def build_cluster(self, cid):
+        """Links the entrance cells of cluster `cid` by their in-cluster BFS distances."""
+        nodes = self.cluster_nodes(cid)
+        edges = {}
+        for u in nodes:
+            reach = self.local_bfs(u, cid)
+            edges[u] = [(v, reach[v][0]) for v in nodes if v != u and v in reach]
+        self.intra[cid] = edges
+        self.rebuilds += 1
+
+    def refresh(self):
+        """
+        Rebuilds the clusters marked dirty by grid changes, plus neighbors
+        whose shared entrances moved.
+        """
+        if not self.dirty:
+            return
+        rebuild = set(self.dirty)
+        keys = {key for cid in self.dirty for key in self.border_keys(cid)}
+        for key in keys:
+            old = self.borders.get(key)
+            self.build_border(key)
+            if self.borders[key] != old:
+                rebuild.update(key)
+        for cid in rebuild:
+            self.build_cluster(cid)
+        self.dirty.clear()
+
+    # --- Queries ---
+    def find_path(self, s, t, draw, deadline=float('inf')):
+        """
+        Abstract A* from cell s to cell t, then refinement of only the
+        clusters on the route. Returns a list of cell indices, None if
+        unreachable, "BREAK" if draw asked to stop, or "TIMEOUT" once
+        metrics.search_clock() passes `deadline`.
+        """
+        self.refresh()
+        grid = self.grid
+        node, cols = grid.node, grid.cols
+        cs, ct = self.cluster_of(s), self.cluster_of(t)
+
+        # Temporarily connect start and target to their clusters' entrances
+        from_s = self.local_bfs(s, cs)
+        start_edges = [(v, from_s[v][0]) for v in self.cluster_nodes(cs) if v in from_s]
+        if t in from_s:
+            start_edges.append((t, from_s[t][0]))
+        from_t = self.local_bfs(t, ct)
+        to_target = {v: from_t[v][0] for v in self.cluster_nodes(ct) if v in from_t}
+
+        tr, tc = divmod(t, cols)
+        def h(u):
+            r, c = divmod(u, cols)
+            return max(abs(r - tr), abs(c - tc))
+
+        g = {s: 0}
+        parent = {s: -1}
+        closed = set()
+        count = 0
+        pq = [(h(s), count, s)]
+        while pq:
+            _, _, u = heapq.heappop(pq)
+            if u in closed: continue
+            closed.add(u)
+            if u == t:
+                break
+            if search_clock() > deadline:
+                return "TIMEOUT"
+            if u == s:
+                succ = list(start_edges)
+            else:
+                succ = list(self.intra.get(self.cluster_of(u), {}).get(u, ()))
+                if u in to_target:
+                    succ.append((t, to_target[u]))
+            succ += [(v, 1) for v in self.inter.get(u, ())]
+            for v, cost in succ:
+                new_g = g[u] + cost
+                if new_g < g.get(v, float('inf')):
+                    g[v] = new_g
+                    parent[v] = u
+                    count += 1
+                    heapq.heappush(pq, (new_g + h(v), count, v))
+                    if draw(node(v), "FRONTIER", len(pq), len(closed)) == "BREAK":
+                        return "BREAK"
+            if draw(node(u), "EXPLORED", len(pq), len(closed)) == "BREAK":
+                return "BREAK"
+        if t not in closed:
+            return None
+
+        abstract = []
+        u = t
+        while u != -1:
+            abstract.append(u)
+            u = parent[u]
+        abstract.reverse()
+        return self.refine(abstract)
+
+    def refine(self, abstract):
+        """Expands each abstract hop into cells with a cluster-local BFS."""
+        cells = [abstract[0]]
+        for u, v in zip(abstract, abstract[1:]):
+            cid = self.cluster_of(u)
+            if self.cluster_of(v) != cid:
+                cells.append(v)  # Transition: one step across a border
+                continue
+            reach = self.local_bfs(u, cid)
+            hop = []
+            w = v
+            while w != u:
+                hop.append(w)
+                w = reach[w][1]
+            cells.extend(reversed(hop))
+        return cells
@@ -2,22 +2,35 @@ import pygame
 import time
 import sys
 from constants import *
-from grid_elements import Node, spawn_dynamic
+from grid_elements import Grid, spawn_dynamic
+from renderer import GridRenderer, load_font
+from dstar_lite import DStarLite
+from flowfield import FlowField
+from viewport import ViewportRenderer
+from stepper import SearchStepper
+from pathwatch import PathWatch
+from searchtrace import Trace, TracePlayer, TraceRecorder
+from mapgen import endpoints
+import movingai
 import algorithm
 
 class App:
-    def __init__(self):
+    def __init__(self, rows=ROWS, cols=COLS):
         pygame.init()
         # Set up display with specific width for Sidebar
         self.screen = pygame.display.set_mode((WIDTH, HEIGHT))
         pygame.display.set_caption("GOOD PERFORMANCE TIME APP")
         
-        # Fonts
-        self.font = pygame.font.SysFont("Segoe UI", 18)
-        self.stat_font = pygame.font.SysFont("Segoe UI", 22, bold=True)
-        self.menu_font = pygame.font.SysFont("Segoe UI", 32, bold=True)
+        # Fonts (cached per process) and the menu, pre-rendered on first use
+        self.font = load_font("Segoe UI", 18)
+        self.stat_font = load_font("Segoe UI", 22, bold=True)
+        self.menu_font = load_font("Segoe UI", 32, bold=True)
+        self.menu_surface = None
         
-        # Grid Initialization
+        # Grid Initialization (the camera renderer is required once the grid outgrows 800px)
+        self.rows, self.cols = rows, cols
+        self.renderer = None
+        self.viewport_mode = rows * GRID_SIZE > 800 or cols * GRID_SIZE > 800
         self.init_grid()
         
         # App State
@@ -26,6 +39,20 @@ class App:
         self.status = "System Ready"
         self.should_break = False # Control flag to stop simulation
         
+        # Stepped search state, advanced once per frame by run()
+        self.stepper = None
+        self.planner = None
+        self.field = None
+        self.path = []
+        self.path_pos = 0
+        self.watch = None # Flags obstacles landing on the path being walked
+        self.next_move = 0
+        self.hold_until = 0
+        self.paused = False
+        self.step_once = False
+        self.speed = DEFAULT_SPEED
+        self.recording = False # T: save a trace of every search
+        
         # Metrics tracking
         self.explored_count = 0
         self.frontier_count = 0
@@ -34,128 +61,161 @@ class App:
 
     def init_grid(self):
         """Initializes or resets the entire grid environment."""
-        self.grid = [[Node(r, c) for c in range(COLS)] for r in range(ROWS)]
-        self.start = self.grid[5][5]
-        self.target = self.grid[ROWS-10][COLS-10]
+        self.grid = Grid(self.rows, self.cols)
+        self.start = self.grid[min(5, self.rows-1)][min(5, self.cols-1)]
+        self.target = self.grid[max(0, self.rows-10)][max(0, self.cols-10)]
         self.explored_count = 0
         self.frontier_count = 0
         self.path_length = 0
+        self.build_renderer()
 
-    def draw_ui(self):
-        """Draws the sidebar dashboard, legend, and hotkey instructions."""
-        pygame.draw.rect(self.screen, COLORS["SIDEBAR"], (800, 0, SIDEBAR_WIDTH, HEIGHT))
-        
-        # Stats Dashboard
-        pygame.draw.rect(self.screen, COLORS["CARD"], (815, 20, 270, 240), border_radius=10)
-        y_offset = 40
-        labels = [
+    def build_renderer(self):
+        """(Re)creates the renderer for the current grid and view mode."""
+        renderer_cls = ViewportRenderer if self.viewport_mode else GridRenderer
+        if self.renderer:
+            self.renderer.close()
+        self.renderer = renderer_cls(self.screen, self.grid, self.start, self.target,
+                                     self.font, self.stat_font)
+
+    def handle_view_event(self, event):
+        """Pan (arrow keys) and zoom (mouse wheel, +/-) for the viewport renderer."""
+        if not self.viewport_mode:
+            return
+        if event.type == pygame.MOUSEWHEEL:
+            self.renderer.zoom_by(event.y, pygame.mouse.get_pos())
+        elif event.type == pygame.KEYDOWN:
+            pans = {pygame.K_UP: (-1, 0), pygame.K_DOWN: (1, 0),
+                    pygame.K_LEFT: (0, -1), pygame.K_RIGHT: (0, 1)}
+            if event.key in pans:
+                self.renderer.pan(*pans[event.key])
+            elif event.key in (pygame.K_EQUALS, pygame.K_PLUS, pygame.K_KP_PLUS):
+                self.renderer.zoom_by(1)
+            elif event.key in (pygame.K_MINUS, pygame.K_KP_MINUS):
+                self.renderer.zoom_by(-1)
+
+    def stat_labels(self):
+        """Text and color of each line on the stats dashboard."""
+        return [
             (f"ALGO: {self.current_algo}", COLORS["ACCENT"]),
             (f"STATUS: {self.status}", (255, 255, 0)),
             (f"EXPLORED: {self.explored_count}", COLORS["TEXT"]),
             (f"FRONTIER: {self.frontier_count}", COLORS["TEXT"]),
             (f"PATH LEN: {self.path_length}", COLORS["PATH"])
         ]
-        
-        for text, color in labels:
-            label_surf = self.stat_font.render(text, True, color)
-            self.screen.blit(label_surf, (830, y_offset))
-            y_offset += 40
-
-        # Legend & Controls
-        pygame.draw.rect(self.screen, COLORS["CARD"], (815, 280, 270, 380), border_radius=10)
-        legend = [("Start", COLORS["START"]), ("Target", COLORS["TARGET"]), 
-                  ("Frontier", COLORS["FRONTIER"]), ("Explored", COLORS["EXPLORED"]),
-                  ("Dynamic", COLORS["DYNAMIC"]), ("Wall", COLORS["WALL"])]
-        for i, (name, col) in enumerate(legend):
-            pygame.draw.rect(self.screen, col, (830, 310 + i*35, 18, 18))
-            txt = self.font.render(name, True, COLORS["TEXT"])
-            self.screen.blit(txt, (860, 308 + i*35))
-            
-        # Hotkeys
-        y_hotkey = 525
-        hotkeys = [
-            ("R: Full Reset", (255, 100, 100)), 
-            ("ESC: Break/Menu", (255, 255, 100)), 
-            ("Q: Exit App", (200, 200, 200))
-        ]
-        for text, color in hotkeys:
-            t_surf = self.font.render(text, True, color)
-            self.screen.blit(t_surf, (830, y_hotkey))
-            y_hotkey += 30
+
+    def speed_label(self):
+        nodes = SPEED_LEVELS[self.speed]
+        label = "SPEED: MAX" if nodes is None else f"SPEED: {nodes} node{'s' if nodes > 1 else ''}/frame"
+        return label + (" (PAUSED)" if self.paused else "")
+
+    def draw_ui(self):
+        """Draws the sidebar dashboard; legend and hotkeys are pre-rendered by the renderer."""
+        self.renderer.draw_stats(self.stat_labels())
+        self.renderer.draw_speed(self.speed_label(), self.speed / (len(SPEED_LEVELS) - 1))
 
     def draw_grid_only(self):
-        """Renders the grid nodes based on their current state."""
-        self.screen.fill(COLORS["BG"])
-        for row in self.grid:
-            for n in row:
-                col = COLORS["EMPTY"]
-                if n == self.start: col = COLORS["START"]
-                elif n == self.target: col = COLORS["TARGET"]
-                elif n.is_wall: col = COLORS["WALL"]
-                elif n.is_dynamic: col = COLORS["DYNAMIC"]
-                n.draw(self.screen, col)
+        """Restores the grid and sidebar from the renderer's cached background."""
+        self.renderer.draw_full()
 
     def draw_menu_overlay(self):
         """Renders a central menu with a semi-transparent background."""
-        dim_surface = pygame.Surface((800, 800))
-        dim_surface.set_alpha(180)
-        dim_surface.fill((0, 0, 0))
-        self.screen.blit(dim_surface, (0, 0))
+        if self.menu_surface is None:
+            self.menu_surface = self.build_menu_overlay()
+        self.screen.blit(self.menu_surface, (0, 0))
+
+    def build_menu_overlay(self):
+        """Pre-renders the dimmed backdrop, menu card and labels into one surface."""
+        overlay = pygame.Surface((800, 800), pygame.SRCALPHA)
+        overlay.fill((0, 0, 0, 180))
 
         menu_rect = pygame.Rect(150, 100, 500, 600)
-        pygame.draw.rect(self.screen, COLORS["CARD"], menu_rect, border_radius=15)
-        pygame.draw.rect(self.screen, COLORS["ACCENT"], menu_rect, 3, border_radius=15)
+        pygame.draw.rect(overlay, COLORS["CARD"], menu_rect, border_radius=15)
+        pygame.draw.rect(overlay, COLORS["ACCENT"], menu_rect, 3, border_radius=15)
 
         title = self.menu_font.render("AI PATHFINDER MENU", True, COLORS["ACCENT"])
-        self.screen.blit(title, (235, 130))
+        overlay.blit(title, (235, 130))
 
-        options = ["1: BFS", "2: DFS", "3: UCS", "4: DLS", "5: IDDFS", "6: Bidirectional"]
+        options = ["1: BFS", "2: DFS", "3: UCS", "4: DLS", "5: IDDFS", "6: Bidirectional",
+                   "7: A*", "8: Weighted A*", "9: Jump Point", "0: D* Lite",
+                   "F: Flow Field", "H: HPA*", "I: IDA*", "U: Bi-UCS", "B: Bi-A*"]
         for i, opt in enumerate(options):
             txt = self.font.render(opt, True, COLORS["TEXT"])
-            self.screen.blit(txt, (200, 210 + i*45))
+            # Six options per column
+            overlay.blit(txt, (180 + (i // 6) * 165, 210 + (i % 6) * 45))
 
         footer_lines = [
             "Left-Click: Draw | Right-Click: Erase",
+            "V: Viewport | Arrows/Wheel: Pan & Zoom",
             "R: Reset Grid | ESC: Return to Menu",
+            "T: Record Traces | M: Save Map",
             "Q: Exit Application"
         ]
         for i, line in enumerate(footer_lines):
             f_surf = self.font.render(line, True, (150, 150, 150))
-            self.screen.blit(f_surf, (240, 510 + i*30))
+            overlay.blit(f_surf, (240, 500 + i*30))
+        return overlay
+
+    def handle_speed_mouse(self):
+        """Clicking or dragging on the sidebar slider picks a speed level."""
+        if pygame.mouse.get_pressed()[0]:
+            fraction = self.renderer.speed_at(pygame.mouse.get_pos())
+            if fraction is not None:
+                self.speed = round(fraction * (len(SPEED_LEVELS) - 1))
 
-    def redraw_grid(self, active_node=None, color_key=None, frontier_val=0, explored_val=0):
-        """Updates visualization and checks for interruption signals."""
+    def handle_sim_input(self):
+        """Once-per-frame input while a search or move is running."""
         for event in pygame.event.get():
             if event.type == pygame.QUIT or (event.type == pygame.KEYDOWN and event.key == pygame.K_q):
                 pygame.quit()
                 sys.exit()
-            if event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
-                self.should_break = True
+            if event.type == pygame.KEYDOWN:
+                if event.key == pygame.K_ESCAPE:
+                    self.should_break = True
+                elif event.key == pygame.K_SPACE:
+                    self.paused = not self.paused
+                elif event.key == pygame.K_s: # Single step, stays paused afterwards
+                    self.paused = True
+                    self.step_once = True
+                elif event.key == pygame.K_LEFTBRACKET:
+                    self.speed = max(0, self.speed - 1)
+                elif event.key == pygame.K_RIGHTBRACKET:
+                    self.speed = min(len(SPEED_LEVELS) - 1, self.speed + 1)
+                elif isinstance(self.stepper, TracePlayer):
+                    self.handle_seek(event.key)
+            self.handle_view_event(event)
+        self.handle_speed_mouse()
 
-        self.frontier_count = frontier_val
-        self.explored_count = explored_val
+    def handle_seek(self, key):
+        """Home/End and PageUp/PageDown (a tenth of the trace) move a replay to another step."""
+        player = self.stepper
+        total = len(player.trace)
+        jumps = {pygame.K_HOME: -total, pygame.K_END: total,
+                 pygame.K_PAGEUP: -max(1, total // 10), pygame.K_PAGEDOWN: max(1, total // 10)}
+        if key not in jumps:
+            return
+        paint = player.seek(player.pos + jumps[key])
         self.draw_grid_only()
-        if active_node and color_key:
-            active_node.draw(self.screen, COLORS[color_key])
-        self.draw_ui()
-        pygame.display.update()
-        pygame.time.delay(1)
-        
-        if self.should_break:
-            return "BREAK" # Return signal to algorithms to terminate
+        for idx, color_key in paint.items():
+            self.renderer.paint(self.grid.node(idx), color_key)
 
     def handle_input(self):
         """Processes user input for wall drawing and menu navigation."""
         mouse_pos = pygame.mouse.get_pos()
         if mouse_pos[0] < 800:
             if pygame.mouse.get_pressed()[0]: # Left Click
-                c, r = mouse_pos[0] // GRID_SIZE, mouse_pos[1] // GRID_SIZE
+                r, c = self.renderer.cell_at(mouse_pos)
                 node = self.grid[r][c]
-                if node != self.start and node != self.target:
+                if node != self.start and node != self.target and not node.is_wall:
                     node.is_wall = True
+                    self.renderer.refresh_cell(node)
             elif pygame.mouse.get_pressed()[2]: # Right Click
-                c, r = mouse_pos[0] // GRID_SIZE, mouse_pos[1] // GRID_SIZE
-                self.grid[r][c].is_wall = False
+                r, c = self.renderer.cell_at(mouse_pos)
+                node = self.grid[r][c]
+                if node.is_wall:
+                    node.is_wall = False
+                    self.renderer.refresh_cell(node)
+        else:
+            self.handle_speed_mouse()
 
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
@@ -168,91 +228,226 @@ class App:
                 if event.key == pygame.K_r: # Full Grid Reset
                     self.init_grid()
                     self.status = "System Reset"
+                if event.key == pygame.K_v: # Switch between tile and viewport rendering
+                    self.viewport_mode = not self.viewport_mode
+                    self.build_renderer()
+                if event.key == pygame.K_t:
+                    self.recording = not self.recording
+                    self.status = "Recording traces" if self.recording else "Recording off"
+                if event.key == pygame.K_m: # Save the walls as a MovingAI .map
+                    filename = f"map_{time.strftime('%Y%m%d_%H%M%S')}.map"
+                    movingai.save_map(self.grid, filename)
+                    self.status = f"Saved {filename}"
                 mapping = {
                     pygame.K_1: "BFS", pygame.K_2: "DFS", pygame.K_3: "UCS", 
-                    pygame.K_4: "DLS", pygame.K_5: "IDDFS", pygame.K_6: "BIDIRECTIONAL"
+                    pygame.K_4: "DLS", pygame.K_5: "IDDFS", pygame.K_6: "BIDIRECTIONAL",
+                    pygame.K_7: "ASTAR", pygame.K_8: "WEIGHTED_ASTAR", pygame.K_9: "JPS",
+                    pygame.K_0: "DSTAR_LITE", pygame.K_f: "FLOW_FIELD",
+                    pygame.K_h: "HPA", pygame.K_i: "IDA_STAR",
+                    pygame.K_u: "BIDIRECTIONAL_UCS", pygame.K_b: "BIDIRECTIONAL_ASTAR"
                 }
                 if event.key in mapping:
                     self.current_algo = mapping[event.key]
-                    self.state = "SIMULATING"
-                    self.should_break = False
+                    self.start_search()
+            self.handle_view_event(event)
 
     def run(self):
         """The main application loop."""
         while True:
-            self.draw_grid_only()
-            self.draw_ui()
-            
             if self.state == "MENU":
+                self.draw_grid_only()
+                self.draw_ui()
                 self.handle_input()
-                self.draw_menu_overlay()
-            elif self.state == "SIMULATING":
-                self.start_search()
+                if self.state == "MENU":
+                    self.draw_menu_overlay()
+            else:
+                self.handle_sim_input()
+                if self.state == "SIMULATING":
+                    self.update_search()
+                elif self.state == "MOVING":
+                    self.update_move()
+                elif time.perf_counter() >= self.hold_until:
+                    self.state = "MENU"
+                self.draw_ui()
             
-            pygame.display.update()
+            self.renderer.flush()
             self.clock.tick(60) # Lock to 60 FPS to stabilize window behavior
 
     def start_search(self):
-        """Algorithm controller with dynamic re-planning logic."""
-        self.status = "Searching..."
-        path_found = False
+        """Starts a run of the current algorithm; run() then advances it frame by frame."""
+        self.close_search()
+        # D* Lite keeps its search between RE-PLANNING rounds and only repairs what changed
+        if self.current_algo == "DSTAR_LITE":
+            self.planner = DStarLite(self.grid, self.start.idx, self.target.idx, algorithm.SEARCH_TIMEOUT)
+        self.should_break = False
+        self.paused = False
+        self.plan()
+
+    def plan(self, status="Searching..."):
+        """(Re)starts the search from the current start cell."""
+        self.state = "SIMULATING"
+        self.status = status
+        if self.watch:
+            self.watch.close()
+            self.watch = None
+        self.grid.reset() # Clear path but keep walls
+        self.renderer.set_endpoints(self.start, self.target)
+        self.draw_grid_only()
+        self.draw_ui()
+        self.renderer.flush()
         
-        while not path_found:
-            for r in self.grid:
-                for n in r: n.reset() # Clear path but keep walls
-            
-            algo_func = getattr(algorithm, self.current_algo.lower())
-            
-            # Execute algorithm
-            path = algo_func(self.start, self.target, self.grid, self.redraw_grid) if self.current_algo != "DLS" else \
-                   algo_func(self.start, self.target, 30, self.grid, self.redraw_grid)
-
-            if self.should_break:
-                self.status = "Interrupted"
-                self.state = "MENU"
-                self.should_break = False
-                break
-
-            if not path:
-                self.status = "No Path Found"
-                pygame.display.update()
-                time.sleep(1.5)
-                self.state = "MENU"
-                break
-
-            self.status = "Moving..."
-            self.path_length = len(path)
-            
-            interrupted = False
-            for i, node in enumerate(path):
-                # Movement Interruption Check
-                for event in pygame.event.get():
-                    if event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
-                        self.state = "MENU"
-                        return
-                    if event.type == pygame.QUIT:
-                        pygame.quit()
-                        sys.exit()
-
-                if node.is_dynamic:
-                    self.status = "RE-PLANNING!"
-                    # Set new start point to previous node in path
-                    self.start = path[i-1] if i > 0 else self.start
-                    node.is_dynamic = False # Clear the hurdle
-                    interrupted = True
-                    break
-                
-                node.draw(self.screen, COLORS["PATH"])
-                self.draw_ui()
-                pygame.display.update(pygame.Rect(0, 0, 800, 800))
-                pygame.time.delay(30)
-            
-            if not interrupted:
-                path_found = True
-                self.status = "Success!"
-                pygame.display.update()
-                time.sleep(1.5)
-                self.state = "MENU"
+        self.field = None
+        start, target, grid = self.start, self.target, self.grid
+        if self.planner:
+            planner = self.planner
+            run = lambda draw: planner.plan(start.idx, draw)
+        elif self.current_algo == "FLOW_FIELD":
+            run = self.run_flow_field
+        else:
+            algo = self.current_algo
+            run = lambda draw: algorithm.run_search(algo, start, target, grid, draw)
+        if self.recording:
+            run = self.recorded(run)
+        self.stepper = SearchStepper(run)
+
+    def recorded(self, run):
+        """Wraps a search run so it also saves a trace file in the working directory."""
+        def run_and_record(draw):
+            recorder = TraceRecorder(self.grid, self.start, self.target, self.current_algo, draw)
+            try:
+                path = run(recorder)
+                recorder.add_path(path)
+            finally:
+                recorder.close()
+            filename = f"{self.current_algo.lower()}_{time.strftime('%Y%m%d_%H%M%S')}.pftrace"
+            recorder.save(filename)
+            print(f"Trace saved to {filename}")
+            return path
+        return run_and_record
+
+    def start_replay(self, filename):
+        """Loads a recorded trace and plays it back instead of running a search."""
+        trace = Trace(filename)
+        self.close_search()
+        self.rows, self.cols = trace.rows, trace.cols
+        self.viewport_mode = self.rows * GRID_SIZE > 800 or self.cols * GRID_SIZE > 800
+        self.grid = trace.grid_at(0)
+        self.start, self.target = self.grid.node(trace.start), self.grid.node(trace.target)
+        self.current_algo = trace.algo
+        self.build_renderer()
+        self.should_break = False
+        self.paused = False
+        self.state = "SIMULATING"
+        self.status = "Replaying..."
+        self.draw_grid_only()
+        self.draw_ui()
+        self.renderer.flush()
+        self.stepper = TracePlayer(trace, self.grid)
+
+    def load_map(self, filename):
+        """Replaces the grid with a MovingAI .map file (static, no dynamic obstacles)."""
+        self.close_search()
+        self.grid = movingai.load_map(filename)
+        self.rows, self.cols = self.grid.rows, self.grid.cols
+        self.viewport_mode = self.rows * GRID_SIZE > 800 or self.cols * GRID_SIZE > 800
+        s, t = endpoints(self.grid)
+        if s is None:
+            raise ValueError(f"{filename} has no free cells")
+        self.start, self.target = self.grid.node(s), self.grid.node(t)
+        self.build_renderer()
+        self.status = f"Loaded {filename}"
+
+    def run_flow_field(self, draw):
+        self.field = FlowField.build(self.grid, self.target.idx, draw)
+        return self.field.path(self.start.idx) if self.field else None
+
+    def update_search(self):
+        """Advances the search by one frame's worth of work and paints what it reported."""
+        if self.should_break:
+            self.finish("Interrupted", hold=0)
+            return
+        if self.paused and not self.step_once:
+            return
+        nodes = 1 if self.step_once else SPEED_LEVELS[self.speed]
+        self.step_once = False
+        for node, color_key, frontier_val, explored_val in self.stepper.advance(FRAME_BUDGET, nodes):
+            self.frontier_count = frontier_val
+            self.explored_count = explored_val
+            if node and color_key:
+                self.renderer.paint(node, color_key)
+        if not self.stepper.done:
+            return
+        
+        path = self.stepper.result
+        if self.field:
+            # Overlay the whole distance field before walking it
+            self.renderer.overlay_distance(self.field.dist)
+        if not path:
+            self.finish("No Path Found")
+            return
+        self.status = "Moving..."
+        self.path_length = len(path)
+        self.path, self.path_pos = path, 0
+        self.watch = PathWatch(self.grid, path, REPLAN_LOOKAHEAD)
+        self.state = "MOVING"
+
+    def update_move(self):
+        """
+        Moves the agent one cell along the path every MOVE_DELAY. Obstacles
+        keep spawning while it walks; as soon as one lands on the remaining
+        path (within REPLAN_LOOKAHEAD cells) it re-plans from where it stands.
+        """
+        if self.should_break:
+            self.finish("Interrupted", hold=0)
+            return
+        if (self.paused and not self.step_once) or (not self.step_once and time.perf_counter() < self.next_move):
+            return
+        self.step_once = False
+
+        if self.watch.needs_replan():
+            self.start = self.path[max(0, self.path_pos - 1)]
+            self.plan("RE-PLANNING!")
+            return
+
+        self.renderer.paint(self.path[self.path_pos], "PATH")
+        self.watch.advance(self.path_pos)
+        self.path_pos += 1
+        self.next_move = time.perf_counter() + MOVE_DELAY
+        if self.path_pos == len(self.path):
+            self.finish("Success!")
+        else:
+            spawn_dynamic(self.grid)
+
+    def finish(self, status, hold=1.5):
+        """Ends the run and shows `status` for `hold` seconds before returning to the menu."""
+        self.status = status
+        self.close_search()
+        self.hold_until = time.perf_counter() + hold
+        self.state = "DONE"
+
+    def close_search(self):
+        if self.stepper and not self.stepper.done:
+            self.stepper.cancel()
+        self.stepper = None
+        if self.watch:
+            self.watch.close()
+            self.watch = None
+        if self.planner:
+            self.planner.close()
+            self.planner = None
 
 if __name__ == "__main__":
-    App().run()
\ No newline at end of file
+    # Optional grid size: python main.py [ROWS COLS], replay: python main.py --replay FILE,
+    # or a MovingAI map: python main.py --map FILE.map
+    if len(sys.argv) == 3 and sys.argv[1] == "--replay":
+        app = App()
+        app.start_replay(sys.argv[2])
+        app.run()
+    elif len(sys.argv) == 3 and sys.argv[1] == "--map":
+        app = App()
+        app.load_map(sys.argv[2])
+        app.run()
+    elif len(sys.argv) == 3:
+        App(int(sys.argv[1]), int(sys.argv[2])).run()
+    else:
+        App().run()
\ No newline at end of file
@@ -0,0 +1,75 @@
+import random
+from grid_elements import Grid, WALL
+
+def random_map(rows, cols, density=0.2, seed=0):
+    """Grid with each cell walled independently with probability `density`."""
+    rng = random.Random(seed)
+    flags = bytearray(WALL if rng.random() < density else 0 for _ in range(rows * cols))
+    return Grid(rows, cols, flags=flags, dynamic_rate=0)
+
+def maze_map(rows, cols, density=0.0, seed=0):
+    """
+    Perfect maze carved by an iterative depth-first backtracker on the odd
+    cells; `density` knocks that fraction of the remaining walls back out
+    to create loops.
+    """
+    rng = random.Random(seed)
+    flags = bytearray([WALL]) * (rows * cols)
+    stack = [(1 % rows, 1 % cols)]
+    flags[stack[0][0] * cols + stack[0][1]] = 0
+    while stack:
+        r, c = stack[-1]
+        options = [(dr, dc) for dr, dc in ((-2, 0), (0, 2), (2, 0), (0, -2))
+                   if 0 <= r + dr < rows and 0 <= c + dc < cols and flags[(r + dr) * cols + c + dc]]
+        if not options:
+            stack.pop()
+            continue
+        dr, dc = rng.choice(options)
+        flags[(r + dr // 2) * cols + c + dc // 2] = 0
+        flags[(r + dr) * cols + c + dc] = 0
+        stack.append((r + dr, c + dc))
+    if density:
+        for i in range(rows * cols):
+            if flags[i] and rng.random() < density:
+                flags[i] = 0
+    return Grid(rows, cols, flags=flags, dynamic_rate=0)
+
+def rooms_map(rows, cols, density=0.0, seed=0, room=8):
+    """Square rooms separated by walls with one or two doors each; `density` adds clutter."""
+    rng = random.Random(seed)
+    flags = bytearray(rows * cols)
+    for r in range(rows):
+        for c in range(cols):
+            if r % room == 0 or c % room == 0:
+                flags[r * cols + c] = WALL
+            elif density and rng.random() < density:
+                flags[r * cols + c] = WALL
+    # Doors in every wall segment
+    for r0 in range(0, rows, room):
+        for c0 in range(0, cols, room):
+            for _ in range(2):
+                if r0 and c0 + 1 < cols:
+                    c = min(cols - 1, c0 + rng.randint(1, room - 1))
+                    flags[r0 * cols + c] = 0
+                if c0 and r0 + 1 < rows:
+                    r = min(rows - 1, r0 + rng.randint(1, room - 1))
+                    flags[r * cols + c0] = 0
+    return Grid(rows, cols, flags=flags, dynamic_rate=0)
+
+STYLES = {
+    "random": random_map,
+    "maze": maze_map,
+    "rooms": rooms_map
+}
+
+def generate(style, rows, cols, density=0.2, seed=0):
+    """Builds a map of the given style; see STYLES."""
+    return STYLES[style](rows, cols, density, seed)
+
+def endpoints(grid):
+    """Default query for a generated map: first free cell from the top-left and from the bottom-right."""
+    flags = bytes(grid.flags)
+    first, last = flags.find(0), flags.rfind(0)
+    if first == -1:
+        return None, None
+    return first, last
@@ -0,0 +1,92 @@
+import threading
+import time
+
+# Seconds each thread has spent parked by a stepper.SearchStepper
+_parked = threading.local()
+
+def search_clock():
+    """
+    Clock (in seconds) for search timeouts and stats: time.perf_counter()
+    minus the time the calling thread spent parked between animation
+    frames, so a paused or slowed-down search does not time out.
+    """
+    return time.perf_counter() - getattr(_parked, "seconds", 0.0)
+
+def add_parked(seconds):
+    """Called by the stepper's worker thread after each wait."""
+    _parked.seconds = getattr(_parked, "seconds", 0.0) + seconds
+
+class SearchStats:
+    """
+    Counters for one search run. Every search in algorithm.py fills one in;
+    pass your own as `stats=` (or use algorithm.run_search_stats) to read it.
+
+    status is "found", "no_path", "timeout" or "break" (draw returned
+    "BREAK"), "running" while in progress.
+    """
+    __slots__ = ("algorithm", "expansions", "pushes", "repushes", "peak_frontier",
+                 "path_length", "time", "status", "started", "hooks")
+
+    def __init__(self, algorithm=""):
+        self.reset(algorithm)
+
+    def reset(self, algorithm, hooks=None):
+        self.algorithm = algorithm
+        self.expansions = 0     # nodes taken off the frontier and expanded
+        self.pushes = 0         # nodes put on the frontier
+        self.repushes = 0       # pushes of a node already on it with a better cost
+        self.peak_frontier = 0
+        self.path_length = 0
+        self.time = 0.0
+        self.status = "running"
+        self.hooks = hooks
+        self.started = search_clock()
+
+    def finish(self, status, path=None):
+        """Stamps the outcome, fires on_finish and hands `path` back for the caller to return."""
+        self.time = search_clock() - self.started
+        self.status = status
+        self.path_length = len(path) if path else 0
+        on_finish = _bound(self.hooks, "on_finish")
+        if on_finish: on_finish(self)
+        return path
+
+    def as_dict(self):
+        return {name: getattr(self, name) for name in self.__slots__ if name not in ("started", "hooks")}
+
+    def __repr__(self):
+        return (f"SearchStats({self.algorithm} {self.status}: {self.expansions} expanded, "
+                f"{self.pushes} pushed ({self.repushes} re-pushed), peak frontier "
+                f"{self.peak_frontier}, path {self.path_length}, {self.time * 1000:.2f} ms)")
+
+class SearchHooks:
+    """
+    Instrumentation callbacks; subclass and override the ones you need.
+    Searches look the hooks up once per run and skip any that are not
+    overridden, so an unused hook costs one `if` per event.
+      on_expand(idx) - a cell index is being expanded
+      on_push(idx)   - a cell index was put on the frontier
+      on_finish(stats)
+    """
+    def on_expand(self, idx): pass
+    def on_push(self, idx): pass
+    def on_finish(self, stats): pass
+
+def _bound(hooks, name):
+    """hooks.<name> if the subclass overrides it, else None."""
+    if hooks is None:
+        return None
+    method = getattr(hooks, name, None)
+    if method is None or getattr(method, "__func__", None) is getattr(SearchHooks, name):
+        return None
+    return method
+
+def begin(algorithm, stats=None, hooks=None):
+    """
+    Starts the stats for a search run (creating them if the caller passed
+    none). Returns (stats, on_expand, on_push); the hooks are None when unused.
+    """
+    if stats is None:
+        stats = SearchStats()
+    stats.reset(algorithm, hooks)
+    return stats, _bound(hooks, "on_expand"), _bound(hooks, "on_push")
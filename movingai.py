@@ -0,0 +1,180 @@
+"""
+MovingAI grid benchmark support (https://movingai.com/benchmarks/formats.html).
+
+    python movingai.py arena.map.scen --algos ASTAR,JPS
+    python movingai.py maps/den001d.map.scen --maps maps --limit 200 --out den.json
+
+.map files load into a Grid (dynamic obstacles off) and any Grid saves back
+out. A .scen run solves every query with the algorithms in algorithm.py and
+checks the paths against the listed optimal lengths.
+
+Scenario optima use octile costs (diagonal = sqrt 2) with no corner cutting.
+This grid charges 1 per move and lets diagonals squeeze between two walls,
+so a search here can legitimately come out "longer" (optimal in moves but
+not in octile cost) or "shorter" (it cut a corner). Only "failed" and
+"invalid" results are real errors.
+"""
+import argparse
+import json
+import math
+import mmap
+import os
+import sys
+from grid_elements import Grid, WALL, BLOCKED
+import algorithm
+
+# Terrain characters: '.', 'G' and 'S' (swamp) are passable; '@', 'O', 'T'
+# (trees), 'W' (water) and anything unknown are walls
+LOAD_TABLE = bytes(0 if chr(b) in ".GS" else WALL for b in range(256))
+# Flag byte -> map character; dynamic obstacles are not saved
+SAVE_TABLE = bytes(ord("@") if f & WALL else ord(".") for f in range(256))
+SQRT2 = math.sqrt(2)
+
+def load_map(filename, dynamic_rate=0):
+    """
+    Reads a .map file into a Grid. The file is memory-mapped and the whole
+    body is turned into flags by one bytes.translate() pass (which also
+    drops the line breaks), so 1000x1000+ maps load in milliseconds.
+    """
+    with open(filename, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        header = {}
+        pos = 0
+        while True:
+            end = mm.find(b"\n", pos)
+            if end == -1:
+                raise ValueError(f"{filename}: missing 'map' line")
+            line = mm[pos:end].strip()
+            pos = end + 1
+            if line == b"map":
+                break
+            if line:
+                key, _, value = line.partition(b" ")
+                header[key.decode()] = value.strip().decode()
+        rows, cols = int(header["height"]), int(header["width"])
+        flags = mm[pos:].translate(LOAD_TABLE, b"\r\n")
+    if len(flags) < rows * cols:
+        raise ValueError(f"{filename}: expected {rows}x{cols} cells, found {len(flags)}")
+    return Grid(rows, cols, flags=bytearray(flags[:rows * cols]), dynamic_rate=dynamic_rate)
+
+def save_map(grid, filename):
+    """Writes the walls of `grid` as an octile .map file."""
+    cells = bytes(grid.flags).translate(SAVE_TABLE)
+    cols = grid.cols
+    with open(filename, "wb") as f:
+        f.write(f"type octile\nheight {grid.rows}\nwidth {cols}\nmap\n".encode())
+        f.write(b"\n".join(cells[i:i + cols] for i in range(0, len(cells), cols)))
+        f.write(b"\n")
+
+def load_scen(filename):
+    """
+    Parses a .scen file into a list of query dicts: bucket, map, width,
+    height, start and target as (r, c) and the optimal octile length.
+    """
+    queries = []
+    with open(filename) as f:
+        for line in f:
+            parts = line.split()
+            # Skips the "version 1" header and blank lines
+            if len(parts) != 9:
+                continue
+            bucket, map_name, width, height, sx, sy, gx, gy, optimal = parts
+            queries.append({
+                "bucket": int(bucket),
+                "map": map_name,
+                "width": int(width),
+                "height": int(height),
+                "start": (int(sy), int(sx)),
+                "target": (int(gy), int(gx)),
+                "optimal": float(optimal)
+            })
+    return queries
+
+def octile_length(path):
+    """Octile cost of a path of Nodes (straight = 1, diagonal = sqrt 2)."""
+    diagonal = sum(1 for a, b in zip(path, path[1:]) if a.r != b.r and a.c != b.c)
+    return (len(path) - 1 - diagonal) + diagonal * SQRT2
+
+def check_path(grid, path, s, t):
+    """True if `path` runs from cell s to cell t through free, adjacent cells."""
+    if path[0].idx != s or path[-1].idx != t:
+        return False
+    for a, b in zip(path, path[1:]):
+        if max(abs(a.r - b.r), abs(a.c - b.c)) != 1 or grid.flags[b.idx] & BLOCKED:
+            return False
+    return True
+
+def _resolve_map(map_name, scen_file, map_dir):
+    candidates = [os.path.join(map_dir, os.path.basename(map_name))] if map_dir else []
+    base = os.path.dirname(scen_file)
+    candidates += [os.path.join(base, map_name), os.path.join(base, os.path.basename(map_name)), map_name]
+    for path in candidates:
+        if os.path.exists(path):
+            return path
+    raise FileNotFoundError(f"map {map_name} not found (tried {', '.join(candidates)})")
+
+def run_scen(scen_file, algos=("ASTAR",), map_dir=None, limit=None, log=sys.stderr):
+    """
+    Runs every query of a .scen file (the first `limit` if given) through
+    each algorithm. Returns one result dict per (query, algorithm) with the
+    status: "optimal", "longer", "shorter", "failed" or "invalid".
+    """
+    queries = load_scen(scen_file)[:limit]
+    grids = {}
+    results = []
+    for q in queries:
+        if q["map"] not in grids:
+            grids[q["map"]] = load_map(_resolve_map(q["map"], scen_file, map_dir))
+        grid = grids[q["map"]]
+        start, target = grid[q["start"][0]][q["start"][1]], grid[q["target"][0]][q["target"][1]]
+        for algo in algos:
+            path, stats = algorithm.run_search_stats(algo, start, target, grid)
+            res = {"algo": algo, "bucket": q["bucket"], "start": q["start"], "target": q["target"],
+                   "optimal": q["optimal"], "moves": len(path) - 1 if path else None,
+                   "length": None, "expansions": stats.expansions, "time": stats.time}
+            if not path:
+                res["status"] = "failed"
+            elif not check_path(grid, path, start.idx, target.idx):
+                res["status"] = "invalid"
+            else:
+                res["length"] = octile_length(path)
+                diff = res["length"] - q["optimal"]
+                res["status"] = "optimal" if abs(diff) < 1e-3 else "longer" if diff > 0 else "shorter"
+            results.append(res)
+        print(f"bucket {q['bucket']:>3} {q['start']} -> {q['target']} optimal {q['optimal']:.2f}", file=log)
+    return results
+
+def summarize(results):
+    """Per-algorithm counts of each status plus total time and expansions."""
+    summary = {}
+    for r in results:
+        s = summary.setdefault(r["algo"], {"queries": 0, "time": 0.0, "expansions": 0})
+        s["queries"] += 1
+        s["time"] += r["time"]
+        s["expansions"] += r["expansions"]
+        s[r["status"]] = s.get(r["status"], 0) + 1
+    return summary
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run a MovingAI .scen file through the pathfinding algorithms.")
+    parser.add_argument("scen")
+    parser.add_argument("--algos", default="ASTAR", help="comma-separated algorithm names")
+    parser.add_argument("--maps", help="directory holding the .map files")
+    parser.add_argument("--limit", type=int, help="only run the first N queries")
+    parser.add_argument("--timeout", type=float, default=algorithm.SEARCH_TIMEOUT, help="per-search timeout in seconds")
+    parser.add_argument("--out", help="write every result as JSON")
+    args = parser.parse_args(argv)
+
+    algorithm.SEARCH_TIMEOUT = args.timeout
+    algos = [a.upper() for a in args.algos.split(",") if a]
+    results = run_scen(args.scen, algos, args.maps, args.limit)
+    summary = summarize(results)
+    for algo, s in summary.items():
+        counts = ", ".join(f"{s.get(k, 0)} {k}" for k in ("optimal", "longer", "shorter", "failed", "invalid"))
+        print(f"{algo:>14}: {s['queries']} queries, {counts}; {s['time']:.2f} s, {s['expansions']} expansions")
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump({"summary": summary, "results": results}, f, indent=1)
+    return 1 if any(s.get("failed") or s.get("invalid") for s in summary.values()) else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,301 @@
+"""
+Cooperative multi-agent pathfinding: windowed cooperative A* (WHCA*).
+
+    python multiagent.py --agents 200 --style rooms --rows 100 --cols 100 --seed 3
+    python multiagent.py --map arena.map --agents 500 --window 24 --replan-every 12 --json
+
+Every REPLAN_EVERY ticks all agents plan again, one after another in a
+rotating priority order. Each one runs a space-time A* over the next WINDOW
+ticks that avoids the cells and moves already reserved by the agents
+before it, then reserves its own. Past the window the search is steered by
+the exact distance to the agent's target (a reverse BFS per target), so
+agents keep heading home while only the near future has to be
+coordinated. Agents move one cell per tick (or wait); two agents never
+share a cell or swap places.
+"""
+import argparse
+import heapq
+import json
+import random
+import sys
+import time
+from array import array
+from collections import deque
+from grid_elements import BLOCKED
+import mapgen
+import movingai
+
+WINDOW = 16       # Ticks of the future each cooperative search plans for
+REPLAN_EVERY = 8  # Ticks between planning rounds (at most WINDOW)
+
+def distances(grid, target):
+    """Step distance from every cell to cell `target` (-1 = unreachable)."""
+    dist = array('i', [-1]) * grid.size
+    dist[target] = 0
+    steps, links = grid.steps, grid.links
+    queue = deque([target])
+    while queue:
+        u = queue.popleft()
+        du = dist[u] + 1
+        for d in steps[links[u]]:
+            v = u + d
+            if dist[v] < 0:
+                dist[v] = du
+                queue.append(v)
+    return dist
+
+class ReservationTable:
+    """
+    Space-time reservations for one planning round. cells maps
+    t * size + cell to the agent standing there at tick t; moves maps
+    (t * size + a) * size + b to the agent stepping from a to b between
+    ticks t and t + 1, which is what a swap would collide with.
+    """
+    def __init__(self, size):
+        self.size = size
+        self.cells = {}
+        self.moves = {}
+
+    def can_enter(self, agent, a, b, t):
+        """True if `agent` may step from cell a (at tick t) to cell b (at t + 1)."""
+        size = self.size
+        holder = self.cells.get((t + 1) * size + b)
+        if holder is not None and holder != agent:
+            return False
+        if a != b:
+            holder = self.moves.get((t * size + b) * size + a)
+            if holder is not None and holder != agent:
+                return False
+        return True
+
+    def reserve(self, agent, path, t0):
+        """Reserves `path` (the agent's cell at ticks t0, t0 + 1, ...) for `agent`."""
+        size = self.size
+        for i, cell in enumerate(path):
+            t = t0 + i
+            self.cells[t * size + cell] = agent
+            if i and path[i - 1] != cell:
+                self.moves[((t - 1) * size + path[i - 1]) * size + cell] = agent
+
+def plan_agent(grid, table, agent, start, t0, window, dist):
+    """
+    Space-time A* for one agent from cell `start` at tick t0. Returns its
+    cells for ticks t0 .. t0 + window and the number of expansions. Moves
+    and waits cost one tick; the search ends at the window's horizon, or
+    early at the target if the agent can stay there until the horizon.
+    If every option is reserved it falls back to the best partial plan
+    and lets the simulation sort out the rest.
+    """
+    size, steps, links = grid.size, grid.steps, grid.links
+    horizon = t0 + window
+    if dist[start] < 0:
+        return [start] * (window + 1), 0
+
+    cells = table.cells
+    def can_rest(cell, t):
+        return all(cells.get(k * size + cell, agent) == agent for k in range(t + 1, horizon + 1))
+
+    root = t0 * size + start
+    parent = {root: None}
+    heap = [(dist[start], -t0, start)]
+    closed = set()
+    best, best_key = None, root
+    expansions = 0
+    goal = None
+    while heap:
+        _, neg_t, u = heapq.heappop(heap)
+        t = -neg_t
+        key = t * size + u
+        if key in closed:
+            continue
+        closed.add(key)
+        expansions += 1
+        if t == horizon or (dist[u] == 0 and can_rest(u, t)):
+            goal = key
+            break
+        rank = (dist[u], neg_t)
+        if best is None or rank < best:
+            best, best_key = rank, key
+        # Waiting is the zero offset; moves follow the grid's clockwise order
+        for d in (0,) + steps[links[u]]:
+            v = u + d
+            nkey = (t + 1) * size + v
+            if nkey in closed or nkey in parent or not table.can_enter(agent, u, v, t):
+                continue
+            parent[nkey] = key
+            heapq.heappush(heap, (t + 1 - t0 + dist[v], -(t + 1), v))
+
+    key = goal if goal is not None else best_key
+    path = []
+    while key is not None:
+        path.append(key % size)
+        key = parent[key]
+    path.reverse()
+    # Stay put on the last cell until the horizon (checked by can_rest for a goal)
+    path += [path[-1]] * (window + 1 - len(path))
+    return path, expansions
+
+def _resolve(pos, want):
+    """
+    Safety net for plans that could not avoid each other: makes movers
+    wait until no two agents share a cell or swap places. Waiting agents
+    never clash, so this always settles. Returns how many had to wait.
+    """
+    forced = 0
+    while True:
+        owner = {}
+        clash = None
+        for a, c in enumerate(want):
+            b = owner.get(c)
+            if b is not None:
+                # Of the two, one is moving into the cell; that one waits
+                clash = b if want[b] != pos[b] else a
+                break
+            owner[c] = a
+        if clash is None:
+            for a, c in enumerate(want):
+                b = owner.get(pos[a])
+                if c != pos[a] and b is not None and b != a and pos[b] == c:
+                    clash = a
+                    break
+        if clash is None:
+            return forced
+        want[clash] = pos[clash]
+        forced += 1
+
+class Simulation:
+    """
+    Advances a team of agents over a static grid, one tick per step().
+    `starts` and `targets` are lists of distinct cell indices. report()
+    sums up moves, waits, replanning rounds, conflicts the safety net had
+    to resolve and the throughput in agent-moves per second.
+    """
+    def __init__(self, grid, starts, targets, window=WINDOW, replan_every=REPLAN_EVERY):
+        self.grid = grid
+        self.window = window
+        self.replan_every = max(1, min(replan_every, window))
+        self.pos = list(starts)
+        self.targets = list(targets)
+        self.order = list(range(len(starts)))
+        t0 = time.perf_counter()
+        # Agents with the same target share one distance table
+        tables = {}
+        self.dist = [tables[t] if t in tables else tables.setdefault(t, distances(grid, t)) for t in self.targets]
+        self.setup_time = time.perf_counter() - t0
+        self.plans = None
+        self.plan_tick = 0
+        self.stale = True
+        self.tick = 0
+        self.moves = self.waits = self.conflicts = self.rounds = self.expansions = 0
+        self.plan_time = self.run_time = 0.0
+
+    def replan(self):
+        """One cooperative planning round from the current tick, in priority order."""
+        t_start = time.perf_counter()
+        grid, t0 = self.grid, self.tick
+        table = ReservationTable(grid.size)
+        # Agents that have not planned yet may have to stay where they are
+        for a in self.order:
+            table.cells[t0 * grid.size + self.pos[a]] = a
+            table.cells[(t0 + 1) * grid.size + self.pos[a]] = a
+        plans = [None] * len(self.pos)
+        for a in self.order:
+            path, expanded = plan_agent(grid, table, a, self.pos[a], t0, self.window, self.dist[a])
+            table.reserve(a, path, t0)
+            plans[a] = path
+            self.expansions += expanded
+        # Rotate priorities so no agent is always the one giving way
+        self.order.append(self.order.pop(0))
+        self.plans, self.plan_tick, self.stale = plans, t0, False
+        self.rounds += 1
+        self.plan_time += time.perf_counter() - t_start
+
+    def done(self):
+        return self.pos == self.targets
+
+    def step(self):
+        """Advances every agent by one tick."""
+        if self.stale or self.tick - self.plan_tick >= self.replan_every:
+            self.replan()
+        i = self.tick - self.plan_tick + 1
+        pos = self.pos
+        want = [plan[i] for plan in self.plans]
+        forced = _resolve(pos, want)
+        if forced:
+            self.conflicts += forced
+            self.stale = True
+        for a, cell in enumerate(want):
+            if cell != pos[a]:
+                self.moves += 1
+            elif cell != self.targets[a]:
+                self.waits += 1
+        self.pos = want
+        self.tick += 1
+
+    def run(self, max_ticks):
+        """Steps until every agent has arrived or `max_ticks` have passed."""
+        t0 = time.perf_counter()
+        while self.tick < max_ticks and not self.done():
+            self.step()
+        self.run_time += time.perf_counter() - t0
+        return self.report()
+
+    def report(self):
+        arrived = sum(1 for p, t in zip(self.pos, self.targets) if p == t)
+        return {
+            "agents": len(self.pos),
+            "arrived": arrived,
+            "ticks": self.tick,
+            "moves": self.moves,
+            "waits": self.waits,
+            "conflicts": self.conflicts,
+            "rounds": self.rounds,
+            "expansions": self.expansions,
+            "setup_time": self.setup_time,
+            "plan_time": self.plan_time,
+            "time": self.run_time,
+            "moves_per_sec": self.moves / self.run_time if self.run_time else 0.0
+        }
+
+def random_agents(grid, count, seed=0):
+    """Seeded distinct start cells and distinct target cells, all free."""
+    free = [i for i in range(grid.size) if not grid.flags[i] & BLOCKED]
+    if count > len(free):
+        raise ValueError(f"only {len(free)} free cells for {count} agents")
+    rng = random.Random(seed)
+    return rng.sample(free, count), rng.sample(free, count)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Simulate many agents with windowed cooperative A*.")
+    parser.add_argument("--map", help="MovingAI .map file (default: a generated map)")
+    parser.add_argument("--style", choices=sorted(mapgen.STYLES), default="random")
+    parser.add_argument("--rows", type=int, default=64)
+    parser.add_argument("--cols", type=int, default=64)
+    parser.add_argument("--density", type=float, default=0.15)
+    parser.add_argument("--seed", type=int, default=0, help="seeds the map and the agents")
+    parser.add_argument("--agents", type=int, default=100)
+    parser.add_argument("--window", type=int, default=WINDOW)
+    parser.add_argument("--replan-every", type=int, default=REPLAN_EVERY)
+    parser.add_argument("--ticks", type=int, default=1000, help="stop after this many ticks")
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    args = parser.parse_args(argv)
+
+    if args.map:
+        grid = movingai.load_map(args.map)
+    else:
+        grid = mapgen.generate(args.style, args.rows, args.cols, args.density, args.seed)
+    starts, targets = random_agents(grid, args.agents, args.seed)
+    sim = Simulation(grid, starts, targets, args.window, args.replan_every)
+    report = sim.run(args.ticks)
+    if args.json:
+        print(json.dumps(report))
+    else:
+        print(f"{report['arrived']}/{report['agents']} agents arrived in {report['ticks']} ticks: "
+              f"{report['moves']} moves, {report['waits']} waits, {report['conflicts']} conflicts, "
+              f"{report['rounds']} planning rounds")
+        print(f"{report['time']:.2f} s ({report['plan_time']:.2f} s planning), "
+              f"{report['moves_per_sec']:.0f} agent-moves/s")
+    return 0 if report["arrived"] == report["agents"] else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
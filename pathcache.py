@@ -0,0 +1,92 @@
+from collections import OrderedDict
+from grid_elements import BLOCKED, DIRECTIONS
+import algorithm
+
+class PathCache:
+    """
+    Bounded LRU cache of search results for one Grid, keyed by
+    (start, target, algorithm, DLS depth limit). Instead of keying on the
+    whole map version, entries are invalidated by region, through
+    grid.watchers, so whatever is still cached is valid for the current map:
+    - a cell becoming blocked drops only the paths that run through it or
+      next to it;
+    - a cell becoming free drops "no path" results, plus any path that the
+      new cell could shorten (checked with the octile lower bound).
+    """
+    def __init__(self, grid, max_size=1024):
+        self.grid = grid
+        self.max_size = max_size
+        self.entries = OrderedDict()  # key -> path indices, or None for "no path"
+        self.by_cell = {}             # cell index -> keys of cached paths through it
+        self.hits = self.misses = self.evictions = self.invalidations = 0
+        grid.watchers.append(self.on_change)
+
+    def close(self):
+        """Stops listening to grid changes."""
+        if self.on_change in self.grid.watchers:
+            self.grid.watchers.remove(self.on_change)
+
+    def __len__(self):
+        return len(self.entries)
+
+    def solve(self, start, target, algo="ASTAR", draw=algorithm.null_draw, limit=algorithm.DLS_DEPTH_LIMIT):
+        """Returns the path as Nodes (or None), running the search only on a miss."""
+        key = (start.idx, target.idx, algo.upper(), limit)
+        grid = self.grid
+        if key in self.entries:
+            self.entries.move_to_end(key)
+            self.hits += 1
+            cells = self.entries[key]
+            return [grid.node(i) for i in cells] if cells is not None else None
+
+        self.misses += 1
+        version = grid.version
+        path = algorithm.run_search(algo, start, target, grid, draw, limit)
+        cells = tuple(n.idx for n in path) if path else None
+        # Do not keep results the map changed under (e.g. obstacles spawned mid-search)
+        if grid.version == version or (cells and not any(grid.flags[i] & BLOCKED for i in cells)):
+            self.store(key, cells)
+        return path
+
+    def store(self, key, cells):
+        self.entries[key] = cells
+        if cells:
+            for i in cells:
+                self.by_cell.setdefault(i, set()).add(key)
+        while len(self.entries) > self.max_size:
+            self.discard(next(iter(self.entries)))
+            self.evictions += 1
+
+    def discard(self, key):
+        cells = self.entries.pop(key)
+        if cells:
+            for i in cells:
+                keys = self.by_cell.get(i)
+                if keys:
+                    keys.discard(key)
+                    if not keys: del self.by_cell[i]
+
+    def on_change(self, idx):
+        grid = self.grid
+        if grid.flags[idx] & BLOCKED:
+            stale = set()
+            r, c = divmod(idx, grid.cols)
+            for dr, dc in [(0, 0)] + DIRECTIONS:
+                nr, nc = r + dr, c + dc
+                if 0 <= nr < grid.rows and 0 <= nc < grid.cols:
+                    stale |= self.by_cell.get(nr * grid.cols + nc, set())
+        else:
+            cols = grid.cols
+            stale = set()
+            for key, cells in self.entries.items():
+                if cells is None:
+                    stale.add(key)
+                    continue
+                s, t = key[0], key[1]
+                # Shortest route via idx is at least this many cells long
+                via = algorithm.octile(s, idx, cols) + algorithm.octile(idx, t, cols) + 1
+                if via < len(cells):
+                    stale.add(key)
+        for key in stale:
+            self.discard(key)
+        self.invalidations += len(stale)
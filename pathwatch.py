@@ -0,0 +1,54 @@
+from grid_elements import BLOCKED
+
+class PathWatch:
+    """
+    Watches the path an agent is walking for obstacles. `position` maps
+    every cell of the path to its index, so the grid.watchers callback is a
+    single dict lookup: changes off the path, or at or behind the agent's
+    index `pos`, are ignored, and a cell on the remaining route becoming
+    blocked records the earliest blocked index in `blocked_at`.
+
+    needs_replan() turns true once that obstacle is `lookahead` steps or
+    fewer ahead of the agent (1 = the next cell, None = as soon as the route
+    is hit), so the caller can replan from where the agent stands instead of
+    walking into the obstacle.
+    Call close() to detach from the grid.
+    """
+    def __init__(self, grid, path, lookahead=None):
+        self.grid = grid
+        self.cells = [n.idx for n in path]
+        self.position = {idx: i for i, idx in enumerate(self.cells)}
+        self.lookahead = lookahead
+        self.pos = 0
+        # Obstacles can land on the route while the search is still running
+        self.blocked_at = self._first_blocked(1)
+        grid.watchers.append(self.on_change)
+
+    def close(self):
+        """Stops listening to grid changes."""
+        if self.on_change in self.grid.watchers:
+            self.grid.watchers.remove(self.on_change)
+
+    def _first_blocked(self, i):
+        flags, cells = self.grid.flags, self.cells
+        return next((j for j in range(i, len(cells)) if flags[cells[j]] & BLOCKED), None)
+
+    def advance(self, pos):
+        """Tells the watch the agent now stands on path index `pos`."""
+        self.pos = pos
+
+    def on_change(self, idx):
+        i = self.position.get(idx)
+        if i is None or i <= self.pos:
+            return
+        if self.grid.flags[idx] & BLOCKED:
+            if self.blocked_at is None or i < self.blocked_at:
+                self.blocked_at = i
+        elif i == self.blocked_at:
+            # The first obstacle cleared; look for the next one further along
+            self.blocked_at = self._first_blocked(i + 1)
+
+    def needs_replan(self):
+        if self.blocked_at is None:
+            return False
+        return self.lookahead is None or self.blocked_at - self.pos <= max(1, self.lookahead)
@@ -0,0 +1,197 @@
+import pygame
+from constants import WIDTH, HEIGHT, GRID_SIZE, SIDEBAR_WIDTH, COLORS
+
+# Screen rect (x, y, w, h) of the speed slider's track in the sidebar
+SPEED_TRACK = (840, 750, 220, 10)
+
+# Fonts by (name, size, bold); the SysFont lookup only runs once per process
+_fonts = {}
+
+def load_font(name, size, bold=False):
+    key = (name, size, bold)
+    font = _fonts.get(key)
+    if font is None:
+        font = _fonts[key] = pygame.font.SysFont(name, size, bold=bold)
+    return font
+
+def draw_node(screen, node, color):
+    """Draws the node rectangle with a small offset for the grid effect."""
+    pygame.draw.rect(screen, color, (node.c * GRID_SIZE, node.r * GRID_SIZE, GRID_SIZE - 1, GRID_SIZE - 1))
+
+class TextCache:
+    """Keeps rendered label surfaces until their text or color changes."""
+    def __init__(self, max_size=256):
+        self.max_size = max_size
+        self.surfaces = {}
+
+    def render(self, font, text, color):
+        key = (id(font), text, color)
+        surf = self.surfaces.get(key)
+        if surf is None:
+            if len(self.surfaces) >= self.max_size:
+                self.surfaces.clear()
+            surf = font.render(text, True, color)
+            self.surfaces[key] = surf
+        return surf
+
+class GridRenderer:
+    """
+    Incremental renderer for the App window.
+    The static scene (empty cells, walls, start/target and the sidebar
+    chrome) lives on pre-built surfaces; every event then only repaints the
+    tiles and labels that actually changed and hands their rects to
+    pygame.display.update().
+    """
+    def __init__(self, screen, grid, start, target, font, stat_font):
+        self.screen = screen
+        self.font = font
+        self.stat_font = stat_font
+        self.text = TextCache()
+        self.dirty = []
+        self.stat_cache = {}
+        self.grid = grid
+        self.start, self.target = start, target
+        self.background = pygame.Surface((800, HEIGHT))
+        self.sidebar = pygame.Surface((SIDEBAR_WIDTH, HEIGHT))
+        self.build_background()
+        self.build_sidebar()
+        # Cells whose walls/obstacles change (spawns, replays) repaint themselves
+        grid.watchers.append(self.on_change)
+
+    def close(self):
+        """Stops listening to grid changes."""
+        if self.on_change in self.grid.watchers:
+            self.grid.watchers.remove(self.on_change)
+
+    def on_change(self, idx):
+        self.refresh_cell(self.grid.node(idx))
+
+    # --- Static layers ---
+    def base_color(self, node):
+        """Color of a cell when no search is painting over it."""
+        if node == self.start: return COLORS["START"]
+        if node == self.target: return COLORS["TARGET"]
+        if node.is_wall: return COLORS["WALL"]
+        if node.is_dynamic: return COLORS["DYNAMIC"]
+        return COLORS["EMPTY"]
+
+    def cell_rect(self, node):
+        return pygame.Rect(node.c * GRID_SIZE, node.r * GRID_SIZE, GRID_SIZE - 1, GRID_SIZE - 1)
+
+    def cell_at(self, pos):
+        """Maps a mouse position inside the grid area to (r, c)."""
+        return pos[1] // GRID_SIZE, pos[0] // GRID_SIZE
+
+    def build_background(self):
+        """Pre-renders every cell of the grid in its base color."""
+        self.background.fill(COLORS["BG"])
+        for row in self.grid:
+            for n in row:
+                self.background.fill(self.base_color(n), self.cell_rect(n))
+
+    def build_sidebar(self):
+        """Pre-renders the sidebar cards, legend and hotkeys, which never change."""
+        side = self.sidebar
+        side.fill(COLORS["SIDEBAR"])
+        pygame.draw.rect(side, COLORS["CARD"], (15, 20, 270, 240), border_radius=10)
+        pygame.draw.rect(side, COLORS["CARD"], (15, 280, 270, 400), border_radius=10)
+        pygame.draw.rect(side, COLORS["CARD"], (15, 695, 270, 90), border_radius=10)
+
+        legend = [("Start", COLORS["START"]), ("Target", COLORS["TARGET"]),
+                  ("Frontier", COLORS["FRONTIER"]), ("Explored", COLORS["EXPLORED"]),
+                  ("Dynamic", COLORS["DYNAMIC"]), ("Wall", COLORS["WALL"])]
+        for i, (name, col) in enumerate(legend):
+            pygame.draw.rect(side, col, (30, 310 + i*35, 18, 18))
+            side.blit(self.font.render(name, True, COLORS["TEXT"]), (60, 308 + i*35))
+
+        hotkeys = [
+            ("R: Full Reset", (255, 100, 100)),
+            ("ESC: Break/Menu", (255, 255, 100)),
+            ("V: Toggle Viewport", (150, 200, 255)),
+            ("SPACE: Pause | S: Step", (150, 255, 150)),
+            ("[ / ]: Slower / Faster", (150, 255, 150)),
+            ("Q: Exit App", (200, 200, 200))
+        ]
+        for i, (text, color) in enumerate(hotkeys):
+            side.blit(self.font.render(text, True, color), (30, 515 + i*27))
+
+    # --- Incremental updates ---
+    def set_endpoints(self, start, target):
+        """Moves the start/target markers, repainting only the affected cells."""
+        old = (self.start, self.target)
+        self.start, self.target = start, target
+        for n in old + (start, target):
+            self.refresh_cell(n)
+
+    def refresh_cell(self, node):
+        """Re-bakes one cell into the background after a wall/obstacle edit."""
+        rect = self.cell_rect(node)
+        self.background.fill(self.base_color(node), rect)
+        self.screen.blit(self.background, rect, rect)
+        self.dirty.append(rect)
+
+    def paint(self, node, color_key):
+        """Paints a search state (FRONTIER, EXPLORED, PATH...) over one cell."""
+        self.dirty.append(self.screen.fill(COLORS[color_key], self.cell_rect(node)))
+
+    def overlay_distance(self, dist):
+        """Tints every reachable free cell by its distance (a rows x cols array, -1 = unreachable)."""
+        near, far = COLORS["FIELD_NEAR"], COLORS["FIELD_FAR"]
+        top = max(1, int(dist.max()))
+        for row in self.grid:
+            for n in row:
+                d = int(dist[n.r, n.c])
+                if d < 0 or n == self.start or n == self.target:
+                    continue
+                t = d / top
+                color = tuple(int(a + (b - a) * t) for a, b in zip(near, far))
+                self.dirty.append(self.screen.fill(color, self.cell_rect(n)))
+
+    def draw_stats(self, labels):
+        """Re-blits only the stat lines whose text or color changed."""
+        y_offset = 40
+        for i, (text, color) in enumerate(labels):
+            if self.stat_cache.get(i) != (text, color):
+                self.stat_cache[i] = (text, color)
+                # Restore the card under the previous label before drawing the new one
+                area = pygame.Rect(830, y_offset, 255, 36)
+                self.screen.blit(self.sidebar, area, area.move(-800, 0))
+                self.screen.blit(self.text.render(self.stat_font, text, color), (830, y_offset))
+                self.dirty.append(area)
+            y_offset += 40
+
+    def draw_speed(self, label, fraction):
+        """Redraws the speed card when its label or knob position (0..1) changed."""
+        if self.stat_cache.get("speed") == (label, fraction):
+            return
+        self.stat_cache["speed"] = (label, fraction)
+        area = pygame.Rect(815, 695, 270, 90)
+        self.screen.blit(self.sidebar, area, area.move(-800, 0))
+        self.screen.blit(self.text.render(self.font, label, COLORS["TEXT"]), (830, 710))
+        track = pygame.Rect(SPEED_TRACK)
+        knob_x = track.x + int(track.w * fraction)
+        pygame.draw.rect(self.screen, COLORS["BG"], track, border_radius=5)
+        pygame.draw.rect(self.screen, COLORS["ACCENT"], (track.x, track.y, knob_x - track.x, track.h), border_radius=5)
+        pygame.draw.circle(self.screen, COLORS["TEXT"], (knob_x, track.centery), 9)
+        self.dirty.append(area)
+
+    def speed_at(self, pos):
+        """Slider position (0..1) under the mouse, or None if it is not over the slider."""
+        track = pygame.Rect(SPEED_TRACK).inflate(20, 30)
+        if not track.collidepoint(pos):
+            return None
+        x, _, w, _ = SPEED_TRACK
+        return min(1.0, max(0.0, (pos[0] - x) / w))
+
+    def draw_full(self):
+        """Blits both static layers; used for menus and between searches."""
+        self.screen.blit(self.background, (0, 0))
+        self.screen.blit(self.sidebar, (800, 0))
+        self.stat_cache.clear()
+        self.dirty.append(pygame.Rect(0, 0, WIDTH, HEIGHT))
+
+    def flush(self):
+        """Pushes only the dirty rects to the display."""
+        if self.dirty:
+            pygame.display.update(self.dirty)
+            self.dirty = []
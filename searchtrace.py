@@ -0,0 +1,231 @@
+import mmap
+import struct
+import time
+from array import array
+from grid_elements import Grid, WALL, DYNAMIC
+import algorithm
+
+# File layout (little-endian), every section starting on a 4-byte boundary:
+#   header   HEADER below
+#   map      rows * cols flag bytes, as they were when recording started
+#   ops      one opcode byte per event
+#   cells    uint32 per event: cell index (NO_CELL for flow-field wavefronts)
+#   frontier uint32 per event: frontier_val (for OP_MAP: the cell's new flags)
+#   explored uint32 per event: explored_val
+MAGIC = b"PFTRACE1"
+HEADER = struct.Struct("<8s16sIIIIII")  # magic, algorithm, rows, cols, start, target, events, reserved
+NO_CELL = 0xFFFFFFFF
+
+OP_WAVE, OP_FRONTIER, OP_EXPLORED, OP_PATH, OP_MAP = range(5)
+OPCODES = {None: OP_WAVE, "FRONTIER": OP_FRONTIER, "EXPLORED": OP_EXPLORED, "PATH": OP_PATH}
+COLOR_KEYS = {op: key for key, op in OPCODES.items()}
+COLOR_KEYS[OP_MAP] = "MAP"
+
+def _pad(n):
+    return -n % 4
+
+class TraceRecorder:
+    """
+    Draw observer that records every event of a search into packed arrays,
+    together with every wall/obstacle change on the grid (through
+    grid.watchers), so spawns replay exactly. Events are forwarded to
+    `draw`, so the recorder can sit in front of the App's observer.
+    """
+    def __init__(self, grid, start, target, algo="", draw=algorithm.null_draw):
+        self.grid = grid
+        self.start, self.target, self.algo = start.idx, target.idx, algo
+        self.draw = draw
+        self.flags = bytes(grid.flags)
+        self.ops = array('B')
+        self.cells = array('I')
+        self.frontier = array('I')
+        self.explored = array('I')
+        grid.watchers.append(self.on_change)
+
+    def __call__(self, node, color_key=None, frontier_val=0, explored_val=0):
+        self.ops.append(OPCODES.get(color_key, OP_WAVE))
+        self.cells.append(NO_CELL if node is None else node.idx)
+        self.frontier.append(frontier_val)
+        self.explored.append(explored_val)
+        return self.draw(node, color_key, frontier_val, explored_val)
+
+    def on_change(self, idx):
+        self.ops.append(OP_MAP)
+        self.cells.append(idx)
+        self.frontier.append(self.grid.flags[idx])
+        self.explored.append(0)
+
+    def add_path(self, path):
+        for n in path or ():
+            self.ops.append(OP_PATH)
+            self.cells.append(n.idx)
+            self.frontier.append(0)
+            self.explored.append(0)
+
+    def close(self):
+        """Stops listening to grid changes."""
+        if self.on_change in self.grid.watchers:
+            self.grid.watchers.remove(self.on_change)
+
+    def save(self, filename):
+        n = len(self.ops)
+        with open(filename, "wb") as f:
+            f.write(HEADER.pack(MAGIC, self.algo.encode()[:16], self.grid.rows, self.grid.cols,
+                                self.start, self.target, n, 0))
+            f.write(self.flags + bytes(_pad(len(self.flags))))
+            f.write(self.ops.tobytes() + bytes(_pad(n)))
+            for column in (self.cells, self.frontier, self.explored):
+                f.write(column.tobytes())
+
+def record(name, start, target, grid, filename, draw=algorithm.null_draw):
+    """Runs algorithm `name` like run_search, saving its trace (path included) to `filename`."""
+    recorder = TraceRecorder(grid, start, target, name.upper(), draw)
+    try:
+        path = algorithm.run_search(name, start, target, grid, recorder)
+        recorder.add_path(path)
+    finally:
+        recorder.close()
+    recorder.save(filename)
+    return path
+
+class Trace:
+    """
+    A saved trace, memory-mapped read-only. The event columns are zero-copy
+    memoryviews into the mapping, so opening is instant however long the
+    trace is, and any step can be read or seeked to directly.
+    """
+    def __init__(self, filename):
+        with open(filename, "rb") as f:
+            self.mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, algo, rows, cols, start, target, n, _ = HEADER.unpack_from(self.mm)
+        if magic != MAGIC:
+            self.mm.close()
+            raise ValueError(f"{filename}: not a search trace")
+        self.algo = algo.rstrip(b"\0").decode()
+        self.rows, self.cols = rows, cols
+        self.start, self.target = start, target
+        self.size = rows * cols
+        view = memoryview(self.mm)
+        off = HEADER.size
+        self.flags = view[off:off + self.size]
+        off += self.size + _pad(self.size)
+        self.ops = view[off:off + n]
+        off += n + _pad(n)
+        self.cells, self.frontier, self.explored = (view[off + 4 * n * k:off + 4 * n * (k + 1)].cast("I")
+                                                    for k in range(3))
+
+    def __len__(self):
+        return len(self.ops)
+
+    def __getitem__(self, i):
+        """Event i as (color_key, cell index or None, frontier_val, explored_val)."""
+        cell = self.cells[i]
+        return COLOR_KEYS[self.ops[i]], (None if cell == NO_CELL else cell), self.frontier[i], self.explored[i]
+
+    def close(self):
+        for column in (self.flags, self.ops, self.cells, self.frontier, self.explored):
+            column.release()
+        self.mm.close()
+
+    def path(self):
+        return [cell for op, cell in zip(self.ops, self.cells) if op == OP_PATH]
+
+    def _last_events(self, step, wanted):
+        """Per cell, the index of its last event before `step` whose opcode is in `wanted`."""
+        import numpy as np
+        ops = np.frombuffer(self.ops, np.uint8, step)
+        cells = np.frombuffer(self.cells, np.uint32, step)
+        picked = np.flatnonzero(np.isin(ops, wanted))[::-1]
+        # First hit in the reversed selection = last event for that cell
+        _, first = np.unique(cells[picked], return_index=True)
+        return picked[first]
+
+    def flags_at(self, step):
+        """The map (one flag byte per cell) as it was just before event `step`."""
+        import numpy as np
+        flags = np.frombuffer(self.flags, np.uint8).copy()
+        last = self._last_events(step, [OP_MAP])
+        flags[np.frombuffer(self.cells, np.uint32)[last]] = np.frombuffer(self.frontier, np.uint32)[last]
+        return bytearray(flags.tobytes())
+
+    def grid_at(self, step=0):
+        return Grid(self.rows, self.cols, flags=self.flags_at(step), dynamic_rate=0)
+
+    def paint_at(self, step):
+        """
+        Color key each cell shows just before event `step` (its last
+        FRONTIER/EXPLORED/PATH event), as {cell index: color_key}.
+        """
+        last = self._last_events(step, [OP_FRONTIER, OP_EXPLORED, OP_PATH])
+        cells, ops = self.cells, self.ops
+        return {cells[i]: COLOR_KEYS[ops[i]] for i in last.tolist()}
+
+class TracePlayer:
+    """
+    Plays a Trace back through the advance()/done/result interface of
+    stepper.SearchStepper, so the App animates a replay like a live search.
+    Map events are applied to `grid` through set_flag, so its watchers (the
+    App's renderer among them) see them; the recorded path ends up in
+    `result` as Nodes.
+    """
+    def __init__(self, trace, grid):
+        self.trace, self.grid = trace, grid
+        self.pos = 0
+        self.result = None
+        self.done = False
+        self._finish()
+
+    def _finish(self):
+        n = len(self.trace)
+        while self.pos < n and self.trace.ops[self.pos] == OP_PATH:
+            self.pos += 1
+        if self.pos >= n:
+            self.done = True
+            self.result = [self.grid.node(i) for i in self.trace.path()] or None
+
+    def _apply(self, idx, value):
+        for bit in (WALL, DYNAMIC):
+            self.grid.set_flag(idx, bit, bool(value & bit))
+
+    def advance(self, budget, nodes=None):
+        """Returns up to `budget` seconds / `nodes` expansions worth of recorded events."""
+        deadline = time.perf_counter() + budget
+        trace, node = self.trace, self.grid.node
+        ops, cells, frontier, explored = trace.ops, trace.cells, trace.frontier, trace.explored
+        n = len(trace)
+        events = []
+        while self.pos < n:
+            i = self.pos
+            op = ops[i]
+            self.pos += 1
+            if op == OP_PATH:
+                continue
+            if op == OP_MAP:
+                self._apply(cells[i], frontier[i])
+                continue
+            cell = cells[i]
+            events.append((None if cell == NO_CELL else node(cell), COLOR_KEYS[op], frontier[i], explored[i]))
+            if op != OP_FRONTIER:
+                if nodes is not None:
+                    nodes -= 1
+                    if nodes <= 0: break
+                if time.perf_counter() >= deadline: break
+        self._finish()
+        return events
+
+    def cancel(self):
+        self.pos = len(self.trace)
+        self.done = True
+
+    def seek(self, step):
+        """Jumps to event `step`: the grid is set to that moment's map. Returns trace.paint_at(step)."""
+        step = max(0, min(step, len(self.trace)))
+        flags = self.trace.flags_at(step)
+        for idx in range(self.grid.size):
+            if self.grid.flags[idx] != flags[idx]:
+                self._apply(idx, flags[idx])
+        self.pos = step
+        self.done = False
+        self.result = None
+        self._finish()
+        return self.trace.paint_at(step)
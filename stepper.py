@@ -0,0 +1,79 @@
+import threading
+import time
+from metrics import add_parked
+
+class SearchStepper:
+    """
+    Runs a search as a resumable stepper. `run(draw)` is any search call that
+    reports through the usual draw observer (e.g. a lambda around
+    algorithm.run_search). It runs on a worker thread, but strictly in
+    lockstep with the caller: the worker only runs inside advance(), which
+    lets it go until a time budget or a node count is used up and then
+    parks it again. Grid, planners and renderer are therefore never touched
+    from two threads at once, and the searches themselves stay unchanged.
+
+    advance() returns the draw events recorded since the last call, as
+    (node, color_key, frontier_val, explored_val) tuples, for the caller to
+    paint. Once `done` is set, `result` holds whatever run() returned.
+    """
+    def __init__(self, run):
+        self.run = run
+        self.done = False
+        self.result = None
+        self.error = None
+        self.events = []
+        self.cancelled = False
+        self._resume = threading.Event()
+        self._parked = threading.Event()
+        self._deadline = 0.0
+        self._nodes_left = None
+        self._thread = threading.Thread(target=self._work, daemon=True)
+        self._thread.start()
+
+    def _work(self):
+        self._resume.wait()
+        self._resume.clear()
+        try:
+            self.result = self.run(self._draw)
+        except Exception as e:
+            self.error = e
+        self.done = True
+        self._parked.set()
+
+    def _draw(self, node, color_key=None, frontier_val=0, explored_val=0):
+        self.events.append((node, color_key, frontier_val, explored_val))
+        # Steps are counted in expansions (or flow-field wavefronts), not pushes
+        if color_key != "FRONTIER" and self._nodes_left is not None:
+            self._nodes_left -= 1
+        if (self._nodes_left is not None and self._nodes_left <= 0) or time.perf_counter() >= self._deadline:
+            self._parked.set()
+            parked = time.perf_counter()
+            self._resume.wait()
+            self._resume.clear()
+            # Searches time out on metrics.search_clock, which skips this wait
+            add_parked(time.perf_counter() - parked)
+        if self.cancelled:
+            return "BREAK"
+
+    def advance(self, budget, nodes=None):
+        """
+        Lets the search run for at most `budget` seconds and, if given, at
+        most `nodes` expansions. Returns the events recorded meanwhile.
+        """
+        if not self.done:
+            self._deadline = time.perf_counter() + budget
+            self._nodes_left = nodes
+            self._parked.clear()
+            self._resume.set()
+            self._parked.wait()
+        if self.error is not None:
+            raise self.error
+        events, self.events = self.events, []
+        return events
+
+    def cancel(self):
+        """Makes the next draw call return "BREAK" and waits for the search to unwind."""
+        self.cancelled = True
+        while not self.done:
+            self.advance(1.0)
+        self.events = []
@@ -0,0 +1,191 @@
+"""
+Correctness checks for the searches in algorithm.py, run headless on
+seeded mapgen maps:  python -m pytest -q
+"""
+import random
+import pytest
+import algorithm
+import headless
+import mapgen
+from dstar_lite import DStarLite
+from grid_elements import Grid, WALL, DYNAMIC, BLOCKED
+from pathcache import PathCache
+
+# Searches that must return a shortest path (in moves) whenever one exists
+OPTIMAL = ["BFS", "UCS", "ASTAR", "JPS", "DSTAR_LITE", "FLOW_FIELD",
+           "IDDFS", "IDA_STAR", "BIDIRECTIONAL", "BIDIRECTIONAL_UCS", "BIDIRECTIONAL_ASTAR"]
+# Complete but not optimal; DLS may also miss paths longer than its limit
+SUBOPTIMAL = ["DFS", "DLS", "WEIGHTED_ASTAR", "HPA"]
+
+MAPS = [(style, seed) for style in ("random", "maze", "rooms") for seed in (1, 2, 3)]
+SIZE = 21
+
+def queries(grid, count=4, seed=0):
+    """Corner-to-corner plus a few seeded pairs of free cells, as (r, c) tuples."""
+    s, t = mapgen.endpoints(grid)
+    pairs = [(s, t)]
+    free = [i for i in range(grid.size) if not grid.flags[i] & BLOCKED]
+    rng = random.Random(seed)
+    pairs += [tuple(rng.sample(free, 2)) for _ in range(count - 1)]
+    return [(divmod(a, grid.cols), divmod(b, grid.cols)) for a, b in pairs]
+
+def check_path(grid, path, start, target):
+    assert path[0] == start and path[-1] == target
+    for (r1, c1), (r2, c2) in zip(path, path[1:]):
+        assert max(abs(r1 - r2), abs(c1 - c2)) == 1, f"jump {(r1, c1)} -> {(r2, c2)}"
+        assert not grid.flags[r2 * grid.cols + c2] & BLOCKED, f"{(r2, c2)} is blocked"
+
+def bfs_length(grid, start, target):
+    path = headless.solve(grid, start, target, "BFS")
+    return len(path) if path else None
+
+def test_every_algorithm_is_listed():
+    assert sorted(OPTIMAL + SUBOPTIMAL) == sorted(algorithm.ALGORITHMS)
+
+@pytest.mark.parametrize("style,seed", MAPS)
+@pytest.mark.parametrize("algo", OPTIMAL + SUBOPTIMAL)
+def test_search(algo, style, seed):
+    if algo == "FLOW_FIELD":
+        pytest.importorskip("numpy")
+    grid = mapgen.generate(style, SIZE, SIZE, 0.25, seed)
+    for start, target in queries(grid, seed=seed):
+        expected = bfs_length(grid, start, target)
+        path = headless.solve(grid, start, target, algo)
+        if path:
+            check_path(grid, path, start, target)
+        if algo == "DLS":
+            assert path is None or len(path) - 1 <= algorithm.DLS_DEPTH_LIMIT
+            continue
+        assert (path is None) == (expected is None), f"{algo} {start} -> {target}"
+        if path and algo in OPTIMAL:
+            assert len(path) == expected, f"{algo} {start} -> {target}"
+
+def test_flow_field_from_blocked_start():
+    pytest.importorskip("numpy")
+    grid = Grid(20, 20, dynamic_rate=0)
+    grid.set_flag(grid.index(2, 3), DYNAMIC)
+    path = headless.solve(grid, (2, 3), (15, 17), "FLOW_FIELD")
+    assert path is not None and path[0] == (2, 3)
+    check_path(grid, path[1:], path[1], (15, 17))
+    assert len(path) == bfs_length(grid, (2, 3), (15, 17))
+
+def wall_edits(grid, path, rng, count=3):
+    """Walls a few cells of `path` (never its ends) and frees a few random walls."""
+    for r, c in rng.sample(path[1:-1], min(count, len(path) - 2)):
+        grid.set_flag(r * grid.cols + c, WALL)
+    walls = [i for i in range(grid.size) if grid.flags[i] & WALL]
+    for i in rng.sample(walls, min(count, len(walls))):
+        grid.set_flag(i, WALL, False)
+
+@pytest.mark.parametrize("style,seed", MAPS)
+def test_dstar_lite_after_wall_edits(style, seed):
+    grid = mapgen.generate(style, SIZE, SIZE, 0.2, seed)
+    (start, target), = queries(grid, 1)
+    s, t = grid.index(*start), grid.index(*target)
+    planner = DStarLite(grid, s, t)
+    rng = random.Random(seed)
+    try:
+        for _ in range(4):
+            path = planner.plan(s, algorithm.null_draw)
+            expected = bfs_length(grid, start, target)
+            assert (path is None) == (expected is None)
+            if path is None:
+                break
+            cells = [(n.r, n.c) for n in path]
+            check_path(grid, cells, start, target)
+            assert len(cells) == expected
+            wall_edits(grid, cells, rng)
+    finally:
+        planner.close()
+
+def test_dstar_lite_from_blocked_start():
+    grid = Grid(20, 20, dynamic_rate=0)
+    s, t = grid.index(2, 3), grid.index(15, 17)
+    grid.set_flag(s, DYNAMIC)
+    planner = DStarLite(grid, s, t)
+    try:
+        path = planner.plan(s, algorithm.null_draw)
+    finally:
+        planner.close()
+    assert path is not None
+    assert len(path) == bfs_length(grid, (2, 3), (15, 17))
+
+@pytest.mark.parametrize("seed", range(20))
+def test_dstar_lite_replans_when_agent_cell_is_blocked(seed):
+    grid = mapgen.generate("random", 20, 20, 0.2, seed)
+    s, t = mapgen.endpoints(grid)
+    planner = DStarLite(grid, s, t)
+    try:
+        path = planner.plan(s, algorithm.null_draw)
+        if path is None or len(path) < 6:
+            pytest.skip("no path long enough to walk")
+        # The agent steps ahead, then an obstacle lands on it and walls go up in front
+        here = path[2].idx
+        planner.plan(here, algorithm.null_draw)
+        grid.set_flag(here, DYNAMIC)
+        for n in path[3:5]:
+            grid.set_flag(n.idx, WALL)
+        path = planner.plan(here, algorithm.null_draw)
+    finally:
+        planner.close()
+    start, target = divmod(here, grid.cols), divmod(t, grid.cols)
+    expected = bfs_length(grid, start, target)
+    assert (path is None) == (expected is None)
+    if path:
+        cells = [(n.r, n.c) for n in path]
+        assert cells[0] == start and cells[-1] == target
+        check_path(grid, cells[1:], cells[1], target)
+        assert len(cells) == expected
+
+@pytest.mark.parametrize("style,seed", MAPS)
+def test_path_cache_after_wall_edits(style, seed):
+    grid = mapgen.generate(style, SIZE, SIZE, 0.2, seed)
+    cache = PathCache(grid)
+    rng = random.Random(seed)
+    pairs = queries(grid, 3, seed)
+    try:
+        for _ in range(4):
+            # Each query twice: the repeat must come from the cache
+            for start, target in pairs + pairs:
+                path = headless.solve(grid, start, target, "ASTAR", cache=cache)
+                expected = bfs_length(grid, start, target)
+                assert (path is None) == (expected is None)
+                if path:
+                    check_path(grid, path, start, target)
+                    assert len(path) == expected
+            path = headless.solve(grid, *pairs[0], "BFS")
+            if path:
+                wall_edits(grid, path, rng)
+        assert cache.hits >= 4 * len(pairs) and cache.invalidations
+    finally:
+        cache.close()
+
+def test_path_cache_keys_on_dls_limit():
+    grid = Grid(20, 20, dynamic_rate=0)
+    cache = PathCache(grid)
+    try:
+        assert headless.solve(grid, (0, 0), (0, 10), "DLS", limit=5, cache=cache) is None
+        path = headless.solve(grid, (0, 0), (0, 10), "DLS", limit=15, cache=cache)
+        assert path is not None and len(path) - 1 <= 15
+        assert headless.solve(grid, (0, 0), (0, 10), "DLS", limit=5, cache=cache) is None
+        assert cache.hits == 1
+    finally:
+        cache.close()
+
+@pytest.mark.parametrize("style,seed", MAPS)
+def test_hpa_after_wall_edits(style, seed):
+    grid = mapgen.generate(style, 32, 32, 0.2, seed)
+    rng = random.Random(seed)
+    pairs = queries(grid, 3, seed)
+    for _ in range(4):
+        for start, target in pairs:
+            path = headless.solve(grid, start, target, "HPA")
+            expected = bfs_length(grid, start, target)
+            assert (path is None) == (expected is None)
+            if path:
+                check_path(grid, path, start, target)
+                assert len(path) >= expected
+        path = headless.solve(grid, *pairs[0], "BFS")
+        if path:
+            wall_edits(grid, path, rng)
+    assert grid.hpa is not None and grid.hpa.rebuilds
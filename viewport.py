@@ -0,0 +1,151 @@
+import time
+import numpy as np
+import pygame
+from constants import COLORS
+from grid_elements import WALL, DYNAMIC
+from renderer import GridRenderer
+
+GRID_PX = 800  # Width/height of the grid area left of the sidebar
+
+# Order of the palette used by the per-cell color index buffer
+PALETTE_KEYS = ["EMPTY", "WALL", "DYNAMIC", "START", "TARGET", "FRONTIER", "EXPLORED", "PATH"]
+
+# Shades appended after PALETTE_KEYS for the distance-field overlay
+FIELD_SHADES = 32
+
+# Zoom levels as (pixels per cell, cells per pixel), from far out to close in
+ZOOM_LEVELS = [(1, 8), (1, 4), (1, 2), (1, 1), (2, 1), (4, 1), (8, 1), (20, 1), (40, 1)]
+
+class ViewportRenderer(GridRenderer):
+    """
+    Camera-based renderer for grids too large to draw cell by cell.
+    Each cell only stores a palette index in a NumPy buffer; a frame maps the
+    visible window of that buffer to pixels in one vectorized pass and does a
+    single surfarray blit. Cells outside the camera are never touched.
+    """
+    frame_interval = 1 / 60
+
+    def __init__(self, screen, grid, start, target, font, stat_font):
+        self.rows, self.cols = grid.rows, grid.cols
+        near = np.array(COLORS["FIELD_NEAR"], dtype=np.float64)
+        far = np.array(COLORS["FIELD_FAR"], dtype=np.float64)
+        shades = near + (far - near) * np.linspace(0, 1, FIELD_SHADES)[:, None]
+        self.palette = np.vstack([np.array([COLORS[k] for k in PALETTE_KEYS]), shades]).astype(np.uint8)
+        self.index = {k: i for i, k in enumerate(PALETTE_KEYS)}
+        self.base = np.zeros((self.rows, self.cols), dtype=np.uint8)
+        self.cells = np.zeros((self.rows, self.cols), dtype=np.uint8)
+        self.origin_r = self.origin_c = 0
+        self.grid_dirty = True
+        self.last_frame = 0.0
+        # Start at the closest zoom where the whole map still fits, if any
+        self.zoom = 0
+        for i, (px, stride) in enumerate(ZOOM_LEVELS):
+            if max(self.rows, self.cols) <= GRID_PX // px * stride:
+                self.zoom = i
+        super().__init__(screen, grid, start, target, font, stat_font)
+
+    # --- Camera ---
+    def span(self):
+        """Number of cells visible along each axis at the current zoom."""
+        px, stride = ZOOM_LEVELS[self.zoom]
+        return GRID_PX // px * stride
+
+    def clamp(self):
+        span = self.span()
+        self.origin_r = max(0, min(self.origin_r, self.rows - span))
+        self.origin_c = max(0, min(self.origin_c, self.cols - span))
+        self.grid_dirty = True
+
+    def pan(self, dr, dc):
+        """Moves the camera by a fraction of the visible span."""
+        step = max(1, self.span() // 8)
+        self.origin_r += dr * step
+        self.origin_c += dc * step
+        self.clamp()
+
+    def zoom_by(self, delta, pos=None):
+        """Zooms in (delta > 0) or out, keeping the cell under `pos` fixed."""
+        new_zoom = max(0, min(len(ZOOM_LEVELS) - 1, self.zoom + delta))
+        if new_zoom == self.zoom:
+            return
+        pos = pos or (GRID_PX // 2, GRID_PX // 2)
+        r, c = self.cell_at(pos)
+        self.zoom = new_zoom
+        px, stride = ZOOM_LEVELS[self.zoom]
+        self.origin_r = r - pos[1] // px * stride
+        self.origin_c = c - pos[0] // px * stride
+        self.clamp()
+
+    def cell_at(self, pos):
+        px, stride = ZOOM_LEVELS[self.zoom]
+        r = min(self.rows - 1, self.origin_r + pos[1] // px * stride)
+        c = min(self.cols - 1, self.origin_c + pos[0] // px * stride)
+        return r, c
+
+    # --- Color index buffer ---
+    def base_index(self, node):
+        if node == self.start: return self.index["START"]
+        if node == self.target: return self.index["TARGET"]
+        if node.is_wall: return self.index["WALL"]
+        if node.is_dynamic: return self.index["DYNAMIC"]
+        return self.index["EMPTY"]
+
+    def build_background(self):
+        """Derives the whole base buffer from the grid's flag array in one pass."""
+        flags = np.frombuffer(self.grid.flags, dtype=np.uint8).reshape(self.rows, self.cols)
+        self.base[:] = self.index["EMPTY"]
+        self.base[(flags & DYNAMIC) != 0] = self.index["DYNAMIC"]
+        self.base[(flags & WALL) != 0] = self.index["WALL"]
+        self.base[self.start.r, self.start.c] = self.index["START"]
+        self.base[self.target.r, self.target.c] = self.index["TARGET"]
+        self.cells[:] = self.base
+        self.grid_dirty = True
+
+    def refresh_cell(self, node):
+        self.base[node.r, node.c] = self.cells[node.r, node.c] = self.base_index(node)
+        self.grid_dirty = True
+
+    def paint(self, node, color_key):
+        self.cells[node.r, node.c] = self.index[color_key]
+        self.grid_dirty = True
+
+    def overlay_distance(self, dist):
+        """Maps the whole distance field to gradient palette entries in one pass."""
+        top = max(1, int(dist.max()))
+        shade = (dist.astype(np.int64) * (FIELD_SHADES - 1) // top).astype(np.uint8) + len(PALETTE_KEYS)
+        mask = (dist > 0) & (self.base == self.index["EMPTY"])
+        self.cells[mask] = shade[mask]
+        self.grid_dirty = True
+
+    def render_grid(self):
+        """Maps the visible window of the buffer to pixels and blits it once."""
+        px, stride = ZOOM_LEVELS[self.zoom]
+        span = self.span()
+        r0, c0 = self.origin_r, self.origin_c
+        window = self.cells[r0:r0 + span:stride, c0:c0 + span:stride]
+        # surfarray is indexed [x][y], so columns come first
+        pixels = self.palette[window.T]
+        if px > 1:
+            pixels = pixels.repeat(px, axis=0).repeat(px, axis=1)
+            if px >= 4:
+                # Keep the 1px grid-line gap of the classic renderer
+                pixels[px - 1::px] = COLORS["BG"]
+                pixels[:, px - 1::px] = COLORS["BG"]
+        self.screen.fill(COLORS["BG"], (0, 0, GRID_PX, GRID_PX))
+        self.screen.blit(pygame.surfarray.make_surface(pixels), (0, 0))
+        self.dirty.append(pygame.Rect(0, 0, GRID_PX, GRID_PX))
+        self.grid_dirty = False
+        self.last_frame = time.perf_counter()
+
+    def draw_full(self):
+        self.cells[:] = self.base
+        self.render_grid()
+        self.screen.blit(self.sidebar, (GRID_PX, 0))
+        self.stat_cache.clear()
+        self.dirty.append(pygame.Rect(GRID_PX, 0, self.sidebar.get_width(), self.sidebar.get_height()))
+
+    def flush(self):
+        """Renders at most one grid frame per `frame_interval`, however many cells changed."""
+        if self.grid_dirty and time.perf_counter() - self.last_frame >= self.frame_interval:
+            self.render_grid()
+        super().flush()